@@ -0,0 +1,109 @@
+"""
+Memory footprint of POM elements.
+
+Measures bytes per element with cached web element proxy, like
+``Table.rows`` builds them. Pass checkout of other revision to compare
+with it, e.g. one before slots::
+
+    git worktree add /tmp/pom-before 89fcd16~1
+    python benchmarks/bench_memory.py --baseline /tmp/pom-before
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+
+TREE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class _Container(object):
+    """Stub of rows container."""
+
+    generation = 0
+
+
+def build(ui_cls, count):
+    """Build elements like ``Table.rows`` does, with cached web elements."""
+    from selenium.webdriver.common.by import By
+
+    container = _Container()
+    elements = []
+    for index in range(count):
+        element = ui_cls(By.XPATH, './/tr', index=index)
+        element.container = container
+        repr(element)
+        element.webelement
+        elements.append(element)
+    return elements
+
+
+def footprint(ui_cls, count):
+    """Bytes allocated per element with its web element proxy."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        elements = build(ui_cls, count)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(elements) == count
+    return (after - before) / float(count)
+
+
+def measure(tree, count):
+    """Footprints of elements of pom in tree, measured in own process."""
+    output = subprocess.check_output(
+        [sys.executable, os.path.abspath(__file__), '--measure', tree,
+         '--count', str(count)])
+    return json.loads(output.decode('utf-8'))
+
+
+def main(argv=None):
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--baseline', help='pom checkout to compare with')
+    parser.add_argument('--measure', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.measure:
+        sys.path.insert(0, args.measure)
+        from pom import ui
+        print(json.dumps(dict((name, footprint(getattr(ui, name), args.count))
+                              for name in ('Row', 'Block'))))
+        return
+
+    current = measure(TREE, args.count)
+    baseline = measure(args.baseline, args.count) if args.baseline else {}
+
+    template = '{:<8}{:>14}{:>14}'
+    print(template.format('element', 'baseline, B', 'current, B'))
+    for name in sorted(current):
+        print(template.format(
+            name,
+            '{:.0f}'.format(baseline[name]) if name in baseline else '-',
+            '{:.0f}'.format(current[name])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+"""
+Benchmarks of POM operations on fake webdriver.
+
+Reports wall time and number of webdriver requests per operation::
+
+    python benchmarks/bench_pom.py --latency 0.002
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import os
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pom import base, ui  # noqa
+from pom.base import App, Page, register_pages  # noqa
+from pom.testing import FakeWebDriver  # noqa
+
+URL = 'http://app/'
+
+
+def build_html(rows, options):
+    """HTML of benchmark page."""
+    return '''
+    <form id="form">
+      <input id="name" type="text">
+      <select id="combo">{options}</select>
+      <input id="check" type="checkbox">
+      <button id="submit">OK</button>
+    </form>
+    <div id="spinner" style="display: none">Loading</div>
+    <table id="users">
+      <thead><tr><th>Id</th><th>Name</th><th>Status</th></tr></thead>
+      <tbody>{rows}</tbody>
+    </table>
+    '''.format(
+        options=''.join('<option>option {}</option>'.format(i)
+                        for i in range(options)),
+        rows=''.join('<tr><td>{0}</td><td>user-{0}</td><td>{1}</td></tr>'
+                     .format(i, 'active' if i % 2 else 'blocked')
+                     for i in range(rows)))
+
+
+class FormMain(ui.Form):
+    """Form of benchmark page."""
+
+
+class TableUsers(ui.Table):
+    """Table of benchmark page."""
+
+    columns = {'id': 1, 'name': 2, 'status': 3}
+
+
+ui.register_ui(
+    name=ui.TextField(By.ID, 'name'),
+    combo=ui.ComboBox(By.ID, 'combo'),
+    check=ui.CheckBox(By.ID, 'check'),
+    submit=ui.Button(By.ID, 'submit'))(FormMain)
+
+
+@ui.register_ui(
+    form=FormMain(By.ID, 'form'),
+    spinner=ui.Block(By.ID, 'spinner'),
+    users=TableUsers(By.ID, 'users'))
+class PageMain(Page):
+    """Benchmark page."""
+
+    url = '/'
+
+
+@register_pages([PageMain])
+class Application(App):
+    """Benchmark application."""
+
+
+def _set(ui_name, value):
+    def operation(page):
+        setattr(getattr(page.form, ui_name), 'value', value)
+    return operation
+
+
+def _batch(page):
+    with page.batch():
+        page.form.name.value = 'admin'
+        page.form.check.select()
+        page.form.combo.value = 'option 40'
+        page.form.submit.click()
+
+
+def _show_spinner(page):
+    page.webdriver.query('#spinner')[0].show(after=0.05)
+    page.spinner.wait_for_presence()
+    page.webdriver.query('#spinner')[0].hide()
+
+
+OPERATIONS = [
+    ('UI.click', lambda page: page.form.submit.click()),
+    ('TextField.value = ...', _set('name', 'admin')),
+    ('ComboBox.value = ...', _set('combo', 'option 40')),
+    ('ComboBox.value', lambda page: page.form.combo.value),
+    ('Form.fill(...)',
+     lambda page: page.form.fill(name='admin', combo='option 40')),
+    ('Page.batch() of 4 actions', _batch),
+    ('Table.rows', lambda page: page.users.rows),
+    ('next(Table.iter_rows())', lambda page: next(page.users.iter_rows())),
+    ('Table.row().cell().value',
+     lambda page: page.users.row(name='user-25').cell('status').value),
+    ('Table.snapshot()', lambda page: page.users.snapshot()),
+    ('UI.wait_for_presence (delayed)', _show_spinner),
+]
+
+
+def run(latency, repeat, rows, options):
+    """Run benchmarks and return results.
+
+    Arguments:
+        - latency: float, seconds of every webdriver request.
+        - repeat: int, number of operation runs.
+        - rows: int, number of table rows.
+        - options: int, number of combobox options.
+
+    Returns:
+        - list: (operation name, cold requests, warm requests, seconds).
+    """
+    driver = FakeWebDriver({URL: build_html(rows, options)}, latency=latency)
+    base.browsers['fake'] = lambda: driver
+    try:
+        app = Application(URL, 'fake')
+    finally:
+        del base.browsers['fake']
+
+    results = []
+    for name, operation in OPERATIONS:
+        app.open('/')
+        page = app.page_main
+
+        driver.reset_commands()
+        operation(page)
+        cold = driver.command_count
+
+        driver.reset_commands()
+        start = time.time()
+        for _ in range(repeat):
+            operation(page)
+        duration = (time.time() - start) / repeat
+
+        results.append((name, cold, driver.command_count // repeat,
+                        duration))
+    return results
+
+
+def main(argv=None):
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--latency', type=float, default=0,
+                        help='seconds of every webdriver request')
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--rows', type=int, default=50)
+    parser.add_argument('--options', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    template = '{:<34}{:>8}{:>8}{:>12}'
+    print(template.format('operation', 'cold', 'warm', 'ms'))
+    for name, cold, warm, duration in run(args.latency, args.repeat,
+                                          args.rows, args.options):
+        print(template.format(name, cold, warm,
+                              '{:.2f}'.format(duration * 1000)))
+
+
+if __name__ == '__main__':
+    main()
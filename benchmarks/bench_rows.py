@@ -0,0 +1,125 @@
+"""
+Cost of table row access depending on table size.
+
+Reports webdriver requests and wall time to click row taken from
+``Table.rows`` and row found by index after its element got stale.
+Requests per row don't depend on table size, time of stale rows grows
+only with in-process search of fake webdriver::
+
+    python benchmarks/bench_rows.py --sizes 10 100 1000 --latency 0.002
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pom import base, ui  # noqa
+from pom.base import App, Page, register_pages  # noqa
+from pom.testing import FakeWebDriver  # noqa
+
+URL = 'http://app/'
+
+
+def build_html(rows):
+    """HTML of benchmark page."""
+    return '<table id="users"><tbody>{}</tbody></table>'.format(
+        ''.join('<tr><td>{0}</td><td>user-{0}</td></tr>'.format(i)
+                for i in range(rows)))
+
+
+@ui.register_ui(users=ui.Table(By.ID, 'users'))
+class PageMain(Page):
+    """Benchmark page."""
+
+    url = '/'
+
+
+@register_pages([PageMain])
+class Application(App):
+    """Benchmark application."""
+
+
+def measure(driver, operation, rows):
+    """Requests and seconds per row of operation applied to every row."""
+    driver.reset_commands()
+    start = time.time()
+    for row in rows:
+        operation(row)
+    duration = time.time() - start
+    return (driver.command_count / float(len(rows)),
+            duration / len(rows))
+
+
+def run(size, latency, sample):
+    """Run benchmark on table of size rows.
+
+    Returns:
+        - tuple: (requests, seconds) per row taken from ``Table.rows`` and
+          per stale row found by index.
+    """
+    driver = FakeWebDriver({URL: build_html(size)}, latency=latency)
+    base.browsers['fake'] = lambda: driver
+    try:
+        app = Application(URL, 'fake')
+    finally:
+        del base.browsers['fake']
+    app.open('/')
+
+    step = max(size // sample, 1)
+    rows = app.page_main.users.rows[::step]
+    fresh = measure(driver, lambda row: row.click(), rows)
+
+    for element in driver.query('tbody tr')[::step]:
+        element.replace()
+    stale = measure(driver, lambda row: row.click(), rows)
+
+    app.quit()
+    return fresh, stale
+
+
+def main(argv=None):
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--sizes', type=int, nargs='+',
+                        default=[10, 100, 1000])
+    parser.add_argument('--latency', type=float, default=0,
+                        help='seconds of every webdriver request')
+    parser.add_argument('--sample', type=int, default=10,
+                        help='number of clicked rows')
+    args = parser.parse_args(argv)
+    # stale rows are expected here
+    logging.getLogger('pom').setLevel(logging.ERROR)
+
+    template = '{:<8}{:>14}{:>12}{:>14}{:>12}'
+    print(template.format('rows', 'fresh, req', 'fresh, ms', 'stale, req',
+                          'stale, ms'))
+    for size in args.sizes:
+        fresh, stale = run(size, args.latency, args.sample)
+        print(template.format(
+            size, '{:.1f}'.format(fresh[0]), '{:.2f}'.format(fresh[1] * 1000),
+            '{:.1f}'.format(stale[0]), '{:.2f}'.format(stale[1] * 1000)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+Micro-benchmarks of table selectors construction.
+
+Best of repeats is reported, since single runs are noisy. Legacy code
+had no header text columns, its "header text" selector is built for
+comparison only and isn't valid::
+
+    python benchmarks/bench_selectors.py --number 50000 --repeat 15
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pom.ui import selectors  # noqa
+
+
+def _merge_xpath(xpath, attr):
+    if xpath.endswith(']'):
+        return xpath[:-1] + ' and {}]'.format(attr)
+    else:
+        return xpath + '[{}]'.format(attr)
+
+
+def legacy_row_selector(row_xpath, cell_xpath, columns, **kwgs):
+    """Row selector built like before compilation, values aren't escaped."""
+    pos_tmpl = 'position()={} and contains(., "{}")'
+    cell_selectors = []
+    for name, value in kwgs.items():
+        cell_selectors.append(_merge_xpath(
+            cell_xpath, pos_tmpl.format(columns[name], value)))
+    return _merge_xpath(row_xpath, " and ".join(cell_selectors))
+
+
+def compiled_row_selector(row_xpath, cell_xpath, columns, **kwgs):
+    """Row selector rendered from compiled template."""
+    names = tuple(kwgs)
+    template = selectors.row_template(
+        row_xpath, cell_xpath, tuple([columns[name] for name in names]))
+    return template.render(*kwgs.values())
+
+
+def legacy_cell_selector(cell_xpath, position):
+    """Cell selector built like before."""
+    return _merge_xpath(cell_xpath, 'position()={}'.format(position))
+
+
+CASES = [
+    ('row, 1 column', 'row_selector',
+     ('.//tr', './/td', {'name': 2}), {'name': 'admin'}),
+    ('row, 3 columns', 'row_selector',
+     ('.//tr', './/td', {'name': 2, 'mail': 3, 'role': 4}),
+     {'name': 'admin', 'mail': 'admin@example.com', 'role': 'owner'}),
+    ('row, header text', 'row_selector',
+     ('.//tr', './/td', {'name': 'Name'}), {'name': 'admin'}),
+    ('cell', 'cell_selector', ('.//td', 3), {}),
+]
+
+
+def main(argv=None):
+    """Entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--number', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    implementations = {
+        'row_selector': (legacy_row_selector, compiled_row_selector),
+        'cell_selector': (legacy_cell_selector, selectors.cell_selector),
+    }
+
+    template = '{:<20}{:>14}{:>14}'
+    print(template.format('selector', 'legacy, us', 'compiled, us'))
+    for name, kind, call_args, kwgs in CASES:
+        timings = []
+        for func in implementations[kind]:
+            seconds = min(timeit.repeat(lambda: func(*call_args, **kwgs),
+                                        number=args.number,
+                                        repeat=args.repeat))
+            timings.append('{:.2f}'.format(seconds / args.number * 1e6))
+        print(template.format(name, *timings))
+
+
+if __name__ == '__main__':
+    main()
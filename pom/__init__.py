@@ -18,4 +18,5 @@ Page Object Model.
 # limitations under the License.
 
 from .base import *  # noqa
+from .pool import *  # noqa
 from .utils import *  # noqa
@@ -0,0 +1,652 @@
+"""
+POM asyncio flavour.
+
+It speaks WebDriver wire protocol over pooled keep-alive HTTP connections,
+so one event loop is able to drive many browser sessions concurrently.
+
+Requires python 3.5+ and isn't imported by ``pom`` package implicitly.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import logging
+import time
+
+from six.moves.urllib.parse import urlparse
+
+from selenium.common import exceptions
+from selenium.webdriver.common.by import By
+
+from .base import App, Page
+from .ui import Container, scripts, UI
+from .ui.base import PRESENCE_ERRORS
+
+__all__ = [
+    'AsyncApp',
+    'AsyncBlock',
+    'AsyncPage',
+    'AsyncUI',
+    'AsyncWebDriver',
+    'AsyncWebElement',
+    'HTTPPool',
+]
+
+LOGGER = logging.getLogger(__name__)
+
+ELEMENT_KEY = 'element-6066-11e4-a52e-4f735466cecf'
+
+# Old selenium versions don't have some exceptions, their parents are used.
+_NOT_INTERACTABLE = getattr(exceptions, 'ElementNotInteractableException',
+                            exceptions.InvalidElementStateException)
+_JAVASCRIPT_ERROR = getattr(exceptions, 'JavascriptException',
+                            exceptions.WebDriverException)
+
+W3C_ERRORS = {
+    'no such element': exceptions.NoSuchElementException,
+    'stale element reference': exceptions.StaleElementReferenceException,
+    'element not interactable': _NOT_INTERACTABLE,
+    'invalid element state': exceptions.InvalidElementStateException,
+    'invalid selector': exceptions.InvalidSelectorException,
+    'javascript error': _JAVASCRIPT_ERROR,
+    'timeout': exceptions.TimeoutException,
+    'script timeout': exceptions.TimeoutException,
+    'no such window': exceptions.NoSuchWindowException,
+    'no such frame': exceptions.NoSuchFrameException,
+}
+
+LEGACY_ERRORS = {
+    7: exceptions.NoSuchElementException,
+    10: exceptions.StaleElementReferenceException,
+    11: exceptions.ElementNotVisibleException,
+    12: exceptions.InvalidElementStateException,
+    17: _JAVASCRIPT_ERROR,
+    21: exceptions.TimeoutException,
+    28: exceptions.TimeoutException,
+    32: exceptions.InvalidSelectorException,
+}
+
+
+class HTTPPool(object):
+    """Pool of keep-alive HTTP/1.1 connections to webdriver server."""
+
+    def __init__(self, url, size=10):
+        """Constructor.
+
+        Arguments:
+            - url: string, webdriver server url.
+            - size: int, max number of simultaneous connections.
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.prefix = parsed.path.rstrip('/')
+        self.size = size
+        self.connections = 0
+        self.requests = 0
+        self._idle = []
+        self._semaphore = None
+
+    async def request(self, method, path, payload=None):
+        """Make HTTP request and return status and decoded json body."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.size)
+
+        if payload is None and method == 'POST':
+            payload = {}
+        data = b'' if payload is None else json.dumps(payload).encode('utf-8')
+
+        async with self._semaphore:
+            reused = bool(self._idle)
+            connection = self._idle.pop() if reused else await self._connect()
+            keep_alive = False
+            try:
+                try:
+                    status, body, keep_alive = await self._roundtrip(
+                        connection, method, self.prefix + path, data)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection[1].close()
+                    if not reused:
+                        raise
+                    # server has closed idle keep-alive connection, retry once
+                    connection = await self._connect()
+                    status, body, keep_alive = await self._roundtrip(
+                        connection, method, self.prefix + path, data)
+            finally:
+                # connection in unknown state (cancelled, failed) isn't reused
+                if keep_alive:
+                    self._idle.append(connection)
+                else:
+                    connection[1].close()
+
+        self.requests += 1
+        return status, json.loads(body.decode('utf-8')) if body else None
+
+    def close(self):
+        """Close idle connections."""
+        while self._idle:
+            self._idle.pop()[1].close()
+
+    async def _connect(self):
+        self.connections += 1
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def _roundtrip(self, connection, method, path, data):
+        reader, writer = connection
+        head = ('{} {} HTTP/1.1\r\n'
+                'Host: {}:{}\r\n'
+                'Accept: application/json\r\n'
+                'Content-Type: application/json;charset=UTF-8\r\n'
+                'Content-Length: {}\r\n'
+                'Connection: keep-alive\r\n\r\n').format(
+                    method, path, self.host, self.port, len(data))
+        writer.write(head.encode('latin-1') + data)
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError('Connection is closed by server')
+        status = int(status_line.split()[1])
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, value = line.decode('latin-1').split(':', 1)
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = headers.get('connection', '').lower() != 'close'
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if not size:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b''.join(chunks)
+
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        return status, body, keep_alive
+
+
+class AsyncWebElement(object):
+    """Async web element."""
+
+    def __init__(self, driver, element_id):
+        """Constructor."""
+        self.driver = driver
+        self.id = element_id
+
+    def __repr__(self):
+        """Object representation."""
+        return '{}(id={!r})'.format(self.__class__.__name__, self.id)
+
+    async def _execute(self, method, command, payload=None):
+        return await self.driver.execute(
+            method, '/element/{}{}'.format(self.id, command), payload)
+
+    async def find_element(self, by, value):
+        """Find DOM element inside element."""
+        return await self.driver.find_element(by, value, parent=self)
+
+    async def find_elements(self, by, value):
+        """Find DOM elements inside element."""
+        return await self.driver.find_elements(by, value, parent=self)
+
+    async def click(self):
+        """Click element."""
+        await self._execute('POST', '/click')
+
+    async def clear(self):
+        """Clear element."""
+        await self._execute('POST', '/clear')
+
+    async def send_keys(self, text):
+        """Type text to element."""
+        text = str(text)
+        await self._execute('POST', '/value',
+                            {'text': text, 'value': list(text)})
+
+    async def get_attribute(self, name):
+        """Get element attribute or property."""
+        value = await self._execute('GET', '/property/{}'.format(name))
+        if value is None:
+            value = await self._execute('GET', '/attribute/{}'.format(name))
+        return value
+
+    async def is_displayed(self):
+        """Define is element displayed."""
+        return await self._execute('GET', '/displayed')
+
+    async def is_enabled(self):
+        """Define is element enabled."""
+        return await self._execute('GET', '/enabled')
+
+    async def is_selected(self):
+        """Define is element selected."""
+        return await self._execute('GET', '/selected')
+
+    async def text(self):
+        """Visible text of element."""
+        return await self._execute('GET', '/text')
+
+
+class AsyncWebDriver(object):
+    """Async webdriver client of remote webdriver server."""
+
+    def __init__(self, url, capabilities=None, pool=None):
+        """Constructor.
+
+        Arguments:
+            - url: string, webdriver server url.
+            - capabilities: dict, desired capabilities.
+            - pool: HTTPPool, shared pool of HTTP connections.
+        """
+        self.capabilities = capabilities or {}
+        self.pool = pool or HTTPPool(url)
+        self.session_id = None
+
+    async def start(self):
+        """Start browser session."""
+        status, response = await self.pool.request('POST', '/session', {
+            'capabilities': {'alwaysMatch': self.capabilities},
+            'desiredCapabilities': self.capabilities})
+        value = self._check(status, response)
+        self.session_id = value.get('sessionId') or response['sessionId']
+        return self
+
+    async def execute(self, method, command, payload=None):
+        """Execute webdriver command of session."""
+        status, response = await self.pool.request(
+            method, '/session/{}{}'.format(self.session_id, command), payload)
+        return self._unwrap(self._check(status, response))
+
+    def _check(self, status, response):
+        response = response or {}
+        value = response.get('value')
+
+        if isinstance(value, dict) and 'error' in value:
+            raise W3C_ERRORS.get(value['error'], exceptions.WebDriverException)(
+                value.get('message'))
+
+        legacy_status = response.get('status')
+        if legacy_status:
+            message = value.get('message') if isinstance(value, dict) \
+                else value
+            raise LEGACY_ERRORS.get(
+                legacy_status, exceptions.WebDriverException)(message)
+
+        if status >= 400:
+            raise exceptions.WebDriverException(
+                'HTTP {}: {!r}'.format(status, value))
+
+        return value
+
+    def _unwrap(self, value):
+        if isinstance(value, dict):
+            element_id = value.get(ELEMENT_KEY) or value.get('ELEMENT')
+            if element_id:
+                return AsyncWebElement(self, element_id)
+            return dict((k, self._unwrap(v)) for k, v in value.items())
+        if isinstance(value, list):
+            return [self._unwrap(v) for v in value]
+        return value
+
+    def _wrap(self, value):
+        if isinstance(value, AsyncWebElement):
+            return {ELEMENT_KEY: value.id, 'ELEMENT': value.id}
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(v) for v in value]
+        return value
+
+    async def quit(self):
+        """Close browser session."""
+        await self.execute('DELETE', '')
+        self.session_id = None
+
+    async def get(self, url):
+        """Open url."""
+        await self.execute('POST', '/url', {'url': url})
+
+    async def current_url(self):
+        """Get current url."""
+        return await self.execute('GET', '/url')
+
+    async def refresh(self):
+        """Refresh page."""
+        await self.execute('POST', '/refresh')
+
+    async def forward(self):
+        """Forward."""
+        await self.execute('POST', '/forward')
+
+    async def back(self):
+        """Back."""
+        await self.execute('POST', '/back')
+
+    async def execute_script(self, script, *args):
+        """Execute javascript."""
+        return await self.execute('POST', '/execute/sync', {
+            'script': script, 'args': self._wrap(args)})
+
+    async def find_element(self, by, value, parent=None):
+        """Find DOM element."""
+        return await self.execute(
+            'POST', self._find_command('/element', parent),
+            self._locator(by, value))
+
+    async def find_elements(self, by, value, parent=None):
+        """Find DOM elements."""
+        return await self.execute(
+            'POST', self._find_command('/elements', parent),
+            self._locator(by, value))
+
+    @staticmethod
+    def _find_command(command, parent):
+        if parent is None:
+            return command
+        return '/element/{}{}'.format(parent.id, command)
+
+    @staticmethod
+    def _locator(by, value):
+        if by == By.ID:
+            by, value = By.CSS_SELECTOR, '[id="{}"]'.format(value)
+        elif by == By.NAME:
+            by, value = By.CSS_SELECTOR, '[name="{}"]'.format(value)
+        elif by == By.CLASS_NAME:
+            by, value = By.CSS_SELECTOR, '.{}'.format(value)
+        elif by == By.TAG_NAME:
+            by = By.CSS_SELECTOR
+        return {'using': by, 'value': value}
+
+
+class _Unsupported(object):
+    """Hides sync method of base class, which can't work with async
+    webdriver.
+    """
+
+    def __init__(self, name):
+        """Constructor."""
+        self.name = name
+
+    def __get__(self, obj, cls=None):
+        """Raise error as if there is no such attribute."""
+        raise AttributeError('{!r} is not supported by {}'.format(
+            self.name, (cls or type(obj)).__name__))
+
+
+class _AsyncContainer(object):
+    """Async versions of container methods executing scripts."""
+
+    execute_async_script = _Unsupported('execute_async_script')
+
+    async def _script_root_element(self):
+        return None
+
+    async def execute_script(self, script, *args):
+        """Execute javascript with container DOM element as first argument.
+
+        For page the first argument is ``null``.
+        """
+        return await self.webdriver.execute_script(
+            script, await self._script_root_element(), *args)
+
+    async def find_visible_elements(self, locator, indexes=False):
+        """Find visible DOM elements inside container with one script."""
+        positions, elements = await self.execute_script(
+            scripts.FIND_VISIBLE, locator[0], locator[1])
+        if indexes:
+            return list(zip(positions, elements))
+        return elements
+
+    async def read_values(self, states=False):
+        """Read values of registered ui elements with one script."""
+        return await self.execute_script(
+            scripts.READ_VALUES, self._read_entries(), states)
+
+    async def set_values(self, values):
+        """Set values of registered ui elements.
+
+        Ui elements which script can't set get values with ``set_value``.
+        """
+        values, scripted, fields = self._scripted_values(values)
+        done = set()
+
+        if scripted:
+            failed = await self.execute_script(scripts.SET_VALUES, fields)
+            done = set(scripted) - set(scripted[j] for j in failed)
+
+        for i, (ui_obj, value) in enumerate(values):
+            if i not in done:
+                await ui_obj.set_value(value)
+
+
+class AsyncUI(UI):
+    """Base class of async ui element.
+
+    Actions are coroutines and properties return awaitables.
+    """
+
+    right_click = _Unsupported('right_click')
+    double_click = _Unsupported('double_click')
+    scroll_to = _Unsupported('scroll_to')
+
+    _element = None
+    _element_generation = None
+
+    async def _webelement(self):
+        if self._element_generation != self.generation:
+            self._element = None
+            self._element_generation = self.generation
+
+        if self._element is None:
+            if self.index is not None:
+                elements = await self.container.find_elements(self.locator)
+                self._element = elements[self.index]
+            else:
+                self._element = await self.container.find_element(
+                    self.locator)
+        return self._element
+
+    async def _call(self, name, *args):
+        element = await self._webelement()
+        try:
+            return await getattr(element, name)(*args)
+        except PRESENCE_ERRORS:
+            LOGGER.warning(
+                "{!r} isn't present in DOM. Cache is flushed.".format(self))
+            self._element = None
+            element = await self._webelement()
+            return await getattr(element, name)(*args)
+
+    async def click(self):
+        """Click ui element."""
+        await self.wait_for_presence()
+        await self._call('click')
+
+    async def get_attribute(self, attr_name):
+        """Get attribute of ui element."""
+        await self.wait_for_presence()
+        return await self._call('get_attribute', attr_name)
+
+    async def set_value(self, text):
+        """Set value of ui element."""
+        await self.wait_for_presence()
+        await self._call('clear')
+        await self._call('send_keys', text)
+
+    @property
+    async def value(self):
+        """Get value of ui element."""
+        await self.wait_for_presence()
+        return (await self._call('get_attribute', 'innerHTML')).strip()
+
+    @property
+    async def is_present(self):
+        """Define is ui element present at display."""
+        try:
+            return await self._call('is_displayed')
+        except PRESENCE_ERRORS:
+            return False
+
+    @property
+    async def is_enabled(self):
+        """Define is ui element enabled."""
+        return await self._call('is_enabled')
+
+    @property
+    def webelement(self):
+        """Get awaitable webelement."""
+        return self._webelement()
+
+    async def wait_for_presence(self, timeout=None):
+        """Wait for ui element presence."""
+        await self._wait(True, timeout)
+
+    async def wait_for_absence(self, timeout=None):
+        """Wait for ui element absence."""
+        await self._wait(False, timeout)
+
+    async def _wait(self, presence, timeout):
+        timeout = timeout or self.timeout
+        limit = time.time() + timeout
+        while bool(await self.is_present) != presence:
+            if time.time() > limit:
+                raise Exception("{!r} is still {} after {} sec".format(
+                    self, 'absent' if presence else 'present', timeout))
+            await asyncio.sleep(0.1)
+
+
+class AsyncBlock(_AsyncContainer, AsyncUI, Container):
+    """Async ui block is containerable ui element."""
+
+    async def _script_root_element(self):
+        await self.wait_for_presence()
+        return await self._webelement()
+
+    async def execute_script(self, script, *args):
+        """Execute javascript with block DOM element as first argument."""
+        try:
+            return await super(AsyncBlock, self).execute_script(script, *args)
+        except exceptions.StaleElementReferenceException:
+            self._element = None
+            return await super(AsyncBlock, self).execute_script(script, *args)
+
+    async def find_element(self, locator):
+        """Find DOM element inside container."""
+        await self.wait_for_presence()
+        return await self._call('find_element', *locator)
+
+    async def find_elements(self, locator):
+        """Find DOM elements inside container."""
+        await self.wait_for_presence()
+        return await self._call('find_elements', *locator)
+
+
+class AsyncPage(_AsyncContainer, Page):
+    """Async page of web application."""
+
+    batch = _Unsupported('batch')
+
+    async def find_element(self, locator):
+        """Find DOM element inside page."""
+        return await self.webdriver.find_element(*locator)
+
+    async def find_elements(self, locator):
+        """Find DOM elements inside page."""
+        return await self.webdriver.find_elements(*locator)
+
+    async def refresh(self):
+        """Refresh page."""
+        await self.webdriver.refresh()
+        self.app.navigated()
+
+    async def open(self):
+        """Open page."""
+        await self.app.open(self.url)
+
+    async def forward(self):
+        """Forward."""
+        await self.webdriver.forward()
+        self.app.navigated()
+
+    async def back(self):
+        """Back."""
+        await self.webdriver.back()
+        self.app.navigated()
+
+
+class AsyncApp(App):
+    """Async web application.
+
+    Usage::
+
+        async with MyApp('http://my.app', 'http://127.0.0.1:4444') as app:
+            await app.page_main.open()
+    """
+
+    def __init__(self, url, webdriver_url, capabilities=None, pool=None):
+        """Constructor.
+
+        Arguments:
+            - url: string, application url.
+            - webdriver_url: string, webdriver server url.
+            - capabilities: dict, desired capabilities of browser.
+            - pool: HTTPPool, to share connections among applications.
+        """
+        self.app_url = url.strip('/')
+        self.generation = 0
+        self.webdriver = AsyncWebDriver(webdriver_url, capabilities, pool)
+
+    async def start(self):
+        """Start browser."""
+        LOGGER.info('Start browser session')
+        await self.webdriver.start()
+        return self
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.quit()
+
+    async def open(self, url):
+        """Open url."""
+        await self.webdriver.get(self.app_url + url)
+        self.navigated()
+
+    async def quit(self):
+        """Close browser."""
+        LOGGER.info('Close browser session')
+        await self.webdriver.quit()
+
+    @property
+    async def current_page(self):
+        """Define current page."""
+        current_url = await self.webdriver.current_url()
+        return self._resolve_page(current_url)
+
@@ -17,18 +17,24 @@ POM base classes.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import logging
+import os
 import re
+import threading
 
 from selenium import webdriver
 
-from .ui import Container
+from .pool import SessionPool
+from .ui import Batch, Container
 from .utils import cache, timeit
 
 __all__ = [
     'App',
     'Page',
-    'register_pages'
+    'PageRegistry',
+    'register_pages',
+    'ThreadLocalApp'
 ]
 
 LOGGER = logging.getLogger(__name__)
@@ -47,12 +53,16 @@ def camel2snake(string):
 
 
 def register_pages(pages):
-    """Decorator to register pages in application."""
+    """Decorator to register pages in application.
+
+    Each application class owns its registry. It inherits pages registered
+    in parent application classes before the registration.
+    """
     def wrapper(cls):
         """Wrapper to register pages."""
+        if '_registered_pages' not in cls.__dict__:
+            cls._registered_pages = PageRegistry(cls._registered_pages)
         cls._registered_pages.extend(pages)
-        cls._registered_pages.sort(
-            key=lambda page: len(page.url), reverse=True)
 
         for page in pages:
             func_name = camel2snake(page.__name__)
@@ -69,16 +79,128 @@ def register_pages(pages):
     return wrapper
 
 
+class PageRegistry(object):
+    """Registry of application pages to define page by url.
+
+    Page urls are regexps matched from the beginning of url path, longer
+    url wins. Literal urls are looked up in prefix tree and only patterns
+    longer than the best literal match are tried.
+    """
+
+    cache_size = 128
+
+    def __init__(self, pages=()):
+        """Constructor."""
+        self._pages = []
+        self._ordered = []
+        self._literals = {}
+        self._patterns = []
+        self._resolved = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.extend(pages)
+
+    def __iter__(self):
+        """Iterate over pages, pages with longer urls go first."""
+        return iter(self._ordered)
+
+    def __len__(self):
+        """Number of pages."""
+        return len(self._ordered)
+
+    def extend(self, pages):
+        """Register pages."""
+        with self._lock:
+            self._extend(pages)
+
+    def _extend(self, pages):
+        self._pages.extend(pages)
+        self._ordered = sorted(
+            self._pages, key=lambda page: len(page.url), reverse=True)
+        self._literals = {}
+        self._patterns = []
+        self._resolved.clear()
+
+        for rank, page in enumerate(self._ordered):
+            if _is_literal(page.url):
+                node = self._literals
+                for char in page.url:
+                    node = node.setdefault(char, {})
+                node.setdefault(None, rank)
+            else:
+                self._patterns.append((rank, page, re.compile(page.url)))
+
+    def resolve(self, path):
+        """Define page class and its url parameters by url path.
+
+        Returns ``None`` if there is no suitable page.
+        """
+        with self._lock:
+            try:
+                result = self._resolved.pop(path)
+            except KeyError:
+                result = self._resolve(path)
+                if len(self._resolved) >= self.cache_size:
+                    self._resolved.popitem(last=False)
+
+            self._resolved[path] = result
+            return result
+
+    def _resolve(self, path):
+        node = self._literals
+        best = node.get(None)
+
+        for char in path:
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                best = node[None] if best is None else min(best, node[None])
+
+        for rank, page, pattern in self._patterns:
+            if best is not None and rank > best:
+                break
+            match = pattern.match(path)
+            if match:
+                return page, match.groupdict()
+
+        if best is not None:
+            return self._ordered[best], {}
+
+
+def _is_literal(url):
+    return not any(char in url for char in '.^$*+?{}[]\\|()')
+
+
 class App(object):
     """Web application."""
 
-    _registered_pages = []
+    _registered_pages = PageRegistry()
 
     def __init__(self, url, browser, *args, **kwgs):
-        """Constructor."""
+        """Constructor.
+
+        Arguments:
+            - url: string, application url.
+            - browser: string, browser name, or SessionPool to take browser.
+            - args, kwgs: arguments to launch browser. Browser of pool is
+              launched by pool, only ``timeout`` to wait for free browser
+              is accepted then.
+        """
         self.app_url = url.strip('/')
-        LOGGER.info('Start {!r} browser'.format(browser))
-        self.webdriver = browsers[browser](*args, **kwgs)
+        self.generation = 0
+
+        if isinstance(browser, SessionPool):
+            LOGGER.info('Take browser from pool')
+            timeout = kwgs.pop('timeout', None)
+            if args or kwgs:
+                raise TypeError('Browser of pool is launched with arguments '
+                                'of pool, only timeout is accepted')
+            self._pool = browser
+            self.webdriver = browser.acquire(timeout=timeout)
+        else:
+            LOGGER.info('Start {!r} browser'.format(browser))
+            self._pool = None
+            self.webdriver = browsers[browser](*args, **kwgs)
 
     def open(self, url):
         """Open url.
@@ -87,25 +209,128 @@ class App(object):
             - url: string.
         """
         self.webdriver.get(self.app_url + url)
+        self.navigated()
+
+    def navigated(self):
+        """Notify that browser has navigated.
+
+        Increments navigation generation, so everything verified in browser
+        before is treated as outdated.
+        """
+        self.generation += 1
 
     def quit(self):
-        """Close browser."""
-        LOGGER.info('Close browser')
-        self.webdriver.quit()
+        """Close browser or return it to pool.
+
+        Browser returned to pool isn't referred by application anymore, so
+        it's returned once.
+        """
+        if self._pool is not None:
+            LOGGER.info('Return browser to pool')
+            pool, webdriver = self._pool, self.webdriver
+            self._pool = self.webdriver = None
+            pool.release(webdriver)
+        elif self.webdriver is not None:
+            LOGGER.info('Close browser')
+            self.webdriver.quit()
 
     @property
     def current_page(self):
         """Define current page"""
-        current_url = self.webdriver.current_url
-        for page in self._registered_pages:
-            if re.match(self.app_url + page.url, current_url):
-                return getattr(self, camel2snake(page.__name__))
-        else:
+        return self._resolve_page(self.webdriver.current_url)
+
+    def _resolve_page(self, current_url):
+        result = None
+        if current_url.startswith(self.app_url):
+            result = self._registered_pages.resolve(
+                current_url[len(self.app_url):])
+
+        if result is None:
             raise Exception("Can't define current page")
 
+        page_cls, url_params = result
+        page = getattr(self, camel2snake(page_cls.__name__))
+        page.url_params = url_params
+        return page
+
+
+class ThreadLocalApp(object):
+    """Factory of applications, one per thread of process.
+
+    Application, its pages and ui elements are bound to one browser and
+    shouldn't be shared among threads. Usage::
+
+        facebook = ThreadLocalApp(Facebook)
+
+        def worker():
+            facebook.get().page_main.open()
+
+        ...
+        facebook.quit_all()
+
+    Applications inherited by forked process are ignored, child process
+    launches own ones.
+    """
+
+    def __init__(self, app_cls, *args, **kwgs):
+        """Constructor.
+
+        Arguments:
+            - app_cls: class of application.
+            - args, kwgs: arguments to create application.
+        """
+        self._app_cls = app_cls
+        self._args = args
+        self._kwgs = kwgs
+        self._lock = threading.Lock()
+        self._reset()
+
+    def get(self):
+        """Get application of current thread."""
+        if self._pid != os.getpid():
+            self._reset()
+
+        app = getattr(self._local, 'app', None)
+        if app is None:
+            app = self._local.app = self._app_cls(*self._args, **self._kwgs)
+            with self._lock:
+                self._apps.append(app)
+        return app
+
+    def quit(self):
+        """Quit application of current thread."""
+        app = getattr(self._local, 'app', None)
+        if app is not None and self._pid == os.getpid():
+            self._local.app = None
+            with self._lock:
+                if app in self._apps:
+                    self._apps.remove(app)
+            app.quit()
+
+    def quit_all(self):
+        """Quit applications of all threads of current process."""
+        if self._pid != os.getpid():
+            return
+
+        with self._lock:
+            apps, self._apps = self._apps, []
+            self._local = threading.local()
+
+        for app in apps:
+            app.quit()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._local = threading.local()
+        self._apps = []
+
 
 class Page(Container):
-    """Page of web application."""
+    """Page of web application.
+
+    Page url is regexp. Its named groups are available in ``url_params``
+    when page is defined as current page of application.
+    """
 
     url = None
 
@@ -114,11 +339,34 @@ class Page(Container):
         self.app = app
         self.webdriver = app.webdriver
         self.webelement = self.webdriver
+        self.url_params = {}
+
+    @property
+    def generation(self):
+        """Navigation generation of application."""
+        return self.app.generation
+
+    def batch(self):
+        """Batch of ui actions executed with as few requests as possible.
+
+        Usage::
+
+            with page.batch():
+                page.form.name.value = 'admin'
+                page.form.agree.select()
+                page.form.submit.click()
+
+        Clicks, values of text fields, checkbox and combobox selections are
+        recorded inside block and executed at its end in the same order.
+        Batched clicks are synthetic, see ``pom.ui.batch.Batch``.
+        """
+        return Batch(self)
 
     @timeit
     def refresh(self):
         """Refresh page."""
         self.webdriver.refresh()
+        self.app.navigated()
 
     @timeit
     def open(self):
@@ -129,8 +377,10 @@ class Page(Container):
     def forward(self):
         """Forward."""
         self.webdriver.forward()
+        self.app.navigated()
 
     @timeit
     def back(self):
         """Back."""
         self.webdriver.back()
+        self.app.navigated()
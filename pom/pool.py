@@ -0,0 +1,223 @@
+"""
+POM browser session pool.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+import time
+
+import six
+
+__all__ = [
+    'SessionPool'
+]
+
+LOGGER = logging.getLogger(__name__)
+
+RESET_STORAGE = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+class SessionPool(object):
+    """Pool of warm browser sessions shared among applications.
+
+    Usage::
+
+        pool = SessionPool('firefox', size=4, max_uses=50)
+        app = MyApp(url, pool)  # takes browser from pool
+        app.quit()  # resets browser and returns it to pool
+        pool.close()
+    """
+
+    blank_url = 'about:blank'
+
+    def __init__(self, browser, size=1, max_uses=None, *args, **kwgs):
+        """Constructor.
+
+        Arguments:
+            - browser: string, browser name, or callable to launch browser.
+            - size: int, number of browsers to pre-launch and keep.
+            - max_uses: int, number of uses before browser is relaunched.
+            - args, kwgs: arguments to launch browser.
+        """
+        from .base import browsers
+
+        self._launcher = browsers[browser] \
+            if isinstance(browser, six.string_types) else browser
+        self._args = args
+        self._kwgs = kwgs
+        self.size = size
+        self.max_uses = max_uses
+
+        self._condition = threading.Condition()
+        self._idle = []
+        self._uses = {}
+        self._busy = set()
+        self._launched = 0
+
+        self.acquired = 0
+        self.hits = 0
+        self.evicted = 0
+        self.wait_time = 0.0
+
+        for _ in range(size):
+            self._idle.append(self._launch())
+
+    def acquire(self, timeout=None):
+        """Take browser from pool.
+
+        Waits for released browser if all of them are busy. Idle browser
+        which doesn't respond is closed and other one is taken.
+        """
+        start = time.time()
+
+        while True:
+            with self._condition:
+                while not self._idle and self._launched >= self.size:
+                    remaining = None
+                    if timeout is not None:
+                        remaining = timeout - (time.time() - start)
+                        if remaining <= 0:
+                            raise Exception(
+                                'No free browser in pool after {} sec'
+                                .format(timeout))
+                    self._condition.wait(remaining)
+
+                if self._idle:
+                    webdriver = self._idle.pop()
+                    self._busy.add(id(webdriver))
+                else:
+                    webdriver = None
+                    self._launched += 1
+
+            if webdriver is None:
+                break
+
+            if self._is_alive(webdriver):
+                with self._condition:
+                    self._count(start, hit=True)
+                return webdriver
+
+            LOGGER.error("Idle browser doesn't respond")
+            self._evict(webdriver)
+
+        try:
+            webdriver = self._launch(counted=True)
+        except Exception:
+            with self._condition:
+                self._launched -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._count(start, hit=False)
+        return webdriver
+
+    def release(self, webdriver):
+        """Reset browser state and return it to pool."""
+        with self._condition:
+            if id(webdriver) not in self._busy:
+                raise Exception("{!r} isn't taken from pool".format(webdriver))
+            self._busy.remove(id(webdriver))
+            self._uses[id(webdriver)] += 1
+            uses = self._uses[id(webdriver)]
+
+        if self.max_uses and uses >= self.max_uses:
+            LOGGER.info('Browser reached {} uses'.format(self.max_uses))
+            self._evict(webdriver)
+            return
+
+        try:
+            self.reset(webdriver)
+        except Exception:
+            LOGGER.exception("Browser doesn't respond")
+            self._evict(webdriver)
+            return
+
+        with self._condition:
+            self._idle.append(webdriver)
+            self._condition.notify()
+
+    def reset(self, webdriver):
+        """Reset browser state: cookies, storages and opened page."""
+        webdriver.delete_all_cookies()
+        webdriver.execute_script(RESET_STORAGE)
+        webdriver.get(self.blank_url)
+
+    def close(self):
+        """Close idle browsers."""
+        with self._condition:
+            idle, self._idle = self._idle, []
+
+        for webdriver in idle:
+            self._quit(webdriver)
+
+    @property
+    def hit_rate(self):
+        """Share of acquirings served with warm browser."""
+        return float(self.hits) / self.acquired if self.acquired else 0.0
+
+    @property
+    def stats(self):
+        """Pool statistics."""
+        return {'acquired': self.acquired,
+                'hits': self.hits,
+                'hit_rate': self.hit_rate,
+                'evicted': self.evicted,
+                'wait_time': self.wait_time}
+
+    def _launch(self, counted=False):
+        LOGGER.info('Launch browser for pool')
+        webdriver = self._launcher(*self._args, **self._kwgs)
+        with self._condition:
+            self._uses[id(webdriver)] = 0
+            if counted:
+                self._busy.add(id(webdriver))
+            else:
+                self._launched += 1
+        return webdriver
+
+    def _is_alive(self, webdriver):
+        try:
+            webdriver.current_url
+        except Exception:
+            return False
+        return True
+
+    def _count(self, start, hit):
+        self.acquired += 1
+        self.hits += hit
+        self.wait_time += time.time() - start
+
+    def _evict(self, webdriver):
+        self._quit(webdriver)
+        with self._condition:
+            self.evicted += 1
+            self._launched -= 1
+            self._condition.notify()
+
+    def _quit(self, webdriver):
+        with self._condition:
+            self._uses.pop(id(webdriver), None)
+            self._busy.discard(id(webdriver))
+        try:
+            webdriver.quit()
+        except Exception:
+            LOGGER.exception("Browser can't be closed")
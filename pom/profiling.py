@@ -0,0 +1,215 @@
+"""
+Profiling of POM operations.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import contextlib
+import threading
+import time
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+__all__ = [
+    'add_sink',
+    'profile',
+    'remove_sink',
+    'Report',
+    'Span',
+]
+
+# Profiling is enabled while there are sinks.
+SINKS = []
+
+_LOCK = threading.Lock()
+_local = threading.local()
+# function itself, python 2 gives new unbound method on every attribute access
+_original_execute = WebDriver.__dict__['execute']
+
+
+class Span(object):
+    """Record of POM operation.
+
+    Attributes:
+        - op: string, operation name, ``<class name>.<method name>``.
+        - target: string, representation of UI or container.
+        - page: string, class name of page containing UI.
+        - start: float, start timestamp.
+        - duration: float, seconds.
+        - commands: int, number of webdriver requests, nested spans included.
+        - depth: int, nesting level, 0 for top level operation.
+        - parent: Span of outer operation or None.
+    """
+
+    __slots__ = ('op', 'target', 'page', 'start', 'duration', 'commands',
+                 'depth', 'parent')
+
+    def __init__(self, op, target=None, page=None, parent=None):
+        """Constructor."""
+        self.op = op
+        self.target = target
+        self.page = page
+        self.parent = parent
+        self.depth = parent.depth + 1 if parent else 0
+        self.commands = 0
+        self.duration = None
+        self.start = time.time()
+
+    def __repr__(self):
+        """Object representation."""
+        return 'Span(op={!r}, target={!r}, duration={:.4f}, commands={})' \
+            .format(self.op, self.target, self.duration or 0, self.commands)
+
+
+def add_sink(sink):
+    """Enable profiling and send finished spans to sink.
+
+    Arguments:
+        - sink: callable, it's called with every finished span.
+    """
+    with _LOCK:
+        if not SINKS:
+            WebDriver.execute = _counted_execute
+        SINKS.append(sink)
+
+
+def remove_sink(sink):
+    """Stop sending spans to sink, profiling is disabled without sinks."""
+    with _LOCK:
+        SINKS.remove(sink)
+        if not SINKS:
+            WebDriver.execute = _original_execute
+
+
+@contextlib.contextmanager
+def profile(sink=None):
+    """Context manager to profile POM operations.
+
+    Usage::
+
+        with profile() as report:
+            page.form.submit()
+        print(report.format())
+
+    Arguments:
+        - sink: callable, sink of spans, ``Report`` by default.
+    """
+    sink = Report() if sink is None else sink
+    add_sink(sink)
+    try:
+        yield sink
+    finally:
+        remove_sink(sink)
+
+
+def start_span(op, obj=None):
+    """Open span of operation on object in current thread."""
+    parent = getattr(_local, 'span', None)
+    target = page = None
+
+    if obj is not None:
+        target = repr(obj)
+        root = obj
+        while getattr(root, 'container', None) is not None:
+            root = root.container
+        page = root.__class__.__name__
+
+    span = _local.span = Span(op, target, page, parent)
+    return span
+
+
+def finish_span(span):
+    """Close span and send it to sinks."""
+    span.duration = time.time() - span.start
+    _local.span = span.parent
+    if span.parent:
+        span.parent.commands += span.commands
+
+    for sink in list(SINKS):
+        sink(span)
+
+
+def count_command():
+    """Count webdriver request in current span."""
+    span = getattr(_local, 'span', None)
+    if span is not None:
+        span.commands += 1
+
+
+def _counted_execute(self, driver_command, params=None):
+    count_command()
+    return _original_execute(self, driver_command, params)
+
+
+class Report(object):
+    """Sink aggregating spans by operation and UI."""
+
+    Stat = collections.namedtuple(
+        'Stat', ['op', 'target', 'page', 'calls', 'duration', 'max_duration',
+                 'commands'])
+
+    def __init__(self):
+        """Constructor."""
+        self.spans = 0
+        self._stats = {}
+        self._durations = collections.defaultdict(float)
+        self._lock = threading.Lock()
+
+    def __call__(self, span):
+        """Aggregate finished span."""
+        key = (span.op, span.target, span.page)
+        with self._lock:
+            self.spans += 1
+            calls, duration, max_duration, commands = self._stats.get(
+                key, (0, 0, 0, 0))
+            self._stats[key] = (calls + 1,
+                                duration + span.duration,
+                                max(max_duration, span.duration),
+                                commands + span.commands)
+            # nested operations on the same UI are counted once
+            if span.target is not None and not (
+                    span.parent and span.parent.target == span.target):
+                self._durations[span.target, span.page] += span.duration
+
+    @property
+    def stats(self):
+        """Statistics of operations on UI."""
+        with self._lock:
+            return [self.Stat(*(key + value))
+                    for key, value in self._stats.items()]
+
+    def slowest(self, count=10):
+        """UI with the longest total duration of operations."""
+        with self._lock:
+            durations = list(self._durations.items())
+        return sorted(durations, key=lambda item: -item[1])[:count]
+
+    def chattiest(self, count=10):
+        """Operations with the largest number of webdriver requests."""
+        return sorted(self.stats, key=lambda stat: -stat.commands)[:count]
+
+    def format(self, count=10):
+        """Text report."""
+        lines = ['Slowest UI:']
+        for (target, page), duration in self.slowest(count):
+            lines.append('  {:.4f}s {} on {}'.format(duration, target, page))
+
+        lines.append('Chattiest operations:')
+        for stat in self.chattiest(count):
+            lines.append('  {} requests in {} calls: {} of {}'.format(
+                stat.commands, stat.calls, stat.op, stat.target))
+        return '\n'.join(lines)
@@ -0,0 +1,336 @@
+"""
+DOM of fake webdriver.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import itertools
+import re
+import time
+
+from six.moves import html_parser
+from six.moves.html_entities import name2codepoint
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+             'link', 'meta', 'param', 'source', 'track', 'wbr'}
+# Text of these elements is serialized as is.
+RAW_TEXT_TAGS = {'script', 'style', 'xmp', 'iframe', 'noembed', 'noframes',
+                 'plaintext'}
+
+_uids = itertools.count(1)
+
+
+class Text(object):
+    """Text node."""
+
+    def __init__(self, text, parent=None):
+        """Constructor."""
+        self.text = text
+        self.parent = parent
+
+    @property
+    def string_value(self):
+        """XPath string value."""
+        return self.text
+
+    def __deepcopy__(self, memo):
+        return Text(self.text)
+
+    def serialize(self):
+        """HTML representation, escaped like browsers do."""
+        if getattr(self.parent, 'tag', None) in RAW_TEXT_TAGS:
+            return self.text
+        return escape_text(self.text)
+
+
+class Element(object):
+    """Element node.
+
+    Visibility can be toggled with ``hide``/``show``, optionally delayed.
+    """
+
+    def __init__(self, tag, attrs=None, parent=None):
+        """Constructor."""
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.parent = parent
+        self.children = []
+        self.uid = 'fake-{}'.format(next(_uids))
+        self.clicks = 0
+        self._visible_since = None
+        self._hidden_since = None
+
+    def __repr__(self):
+        """Object representation."""
+        return '<{} {}>'.format(self.tag, self.uid)
+
+    def __deepcopy__(self, memo):
+        clone = Element(self.tag, self.attrs)
+        for child in self.children:
+            child = copy.deepcopy(child, memo)
+            child.parent = clone
+            clone.children.append(child)
+        return clone
+
+    def append(self, child):
+        """Append child node."""
+        child.parent = self
+        self.children.append(child)
+        return child
+
+    @property
+    def elements(self):
+        """Child elements."""
+        return [child for child in self.children
+                if isinstance(child, Element)]
+
+    def iter(self):
+        """Iterate over descendant elements in document order."""
+        for child in self.elements:
+            yield child
+            for node in child.iter():
+                yield node
+
+    @property
+    def root(self):
+        """Root of tree."""
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    @property
+    def string_value(self):
+        """Text content."""
+        return ''.join(child.string_value for child in self.children)
+
+    @property
+    def text(self):
+        """Visible text like selenium returns."""
+        if not self.is_visible:
+            return ''
+        text = ''.join(child.text for child in self.children)
+        return re.sub(r'\s+', ' ', text).strip()
+
+    @property
+    def inner_html(self):
+        """Inner HTML."""
+        return ''.join(child.serialize() for child in self.children)
+
+    def serialize(self):
+        """HTML representation."""
+        attrs = ''.join(' {}="{}"'.format(name, escape_attribute(value))
+                        for name, value in sorted(self.attrs.items()))
+        if self.tag in VOID_TAGS:
+            return '<{}{}>'.format(self.tag, attrs)
+        return '<{0}{1}>{2}</{0}>'.format(self.tag, attrs, self.inner_html)
+
+    def hide(self, after=0):
+        """Hide element now or after seconds."""
+        self._hidden_since = time.time() + after
+        self._visible_since = None
+
+    def show(self, after=0):
+        """Show element now or after seconds."""
+        self._visible_since = time.time() + after
+        self._hidden_since = None
+
+    def remove(self):
+        """Remove element from DOM."""
+        self.parent.children.remove(self)
+        self.parent = None
+
+    def replace(self):
+        """Replace element with its copy, so found web elements get stale."""
+        clone = copy.deepcopy(self)
+        clone.parent = self.parent
+        siblings = self.parent.children
+        siblings[siblings.index(self)] = clone
+        self.parent = None
+        return clone
+
+    @property
+    def is_hidden(self):
+        """Define is element hidden itself, not considering ancestors."""
+        now = time.time()
+        if self._hidden_since is not None:
+            return now >= self._hidden_since
+        if self._visible_since is not None:
+            return now < self._visible_since
+        style = self.attrs.get('style', '').replace(' ', '')
+        return 'hidden' in self.attrs or self.attrs.get('type') == 'hidden' \
+            or 'display:none' in style or 'visibility:hidden' in style
+
+    @property
+    def is_visible(self):
+        """Define is element displayed."""
+        node = self
+        while isinstance(node, Element):
+            if node.is_hidden:
+                return False
+            node = node.parent
+        return True
+
+    @property
+    def order(self):
+        """Key of document order."""
+        key = []
+        node = self
+        while node.parent is not None:
+            key.append(node.parent.children.index(node))
+            node = node.parent
+        return tuple(reversed(key))
+
+
+def escape_text(text):
+    """Escape text node like browsers serialize it."""
+    return text.replace('&', '&amp;').replace(u'\xa0', '&nbsp;') \
+        .replace('<', '&lt;').replace('>', '&gt;')
+
+
+def escape_attribute(value):
+    """Escape attribute value like browsers serialize it."""
+    return value.replace('&', '&amp;').replace(u'\xa0', '&nbsp;') \
+        .replace('"', '&quot;')
+
+
+class _Parser(html_parser.HTMLParser):
+
+    def __init__(self):
+        html_parser.HTMLParser.__init__(self)
+        self.document = Element('#document')
+        self._current = self.document
+
+    def handle_starttag(self, tag, attrs):
+        element = self._current.append(Element(
+            tag, ((name, '' if value is None else value)
+                  for name, value in attrs)))
+        if tag not in VOID_TAGS:
+            self._current = element
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._current = self._current.parent
+
+    def handle_endtag(self, tag):
+        node = self._current
+        while node is not self.document and node.tag != tag:
+            node = node.parent
+        if node is not self.document:
+            self._current = node.parent
+
+    def handle_data(self, data):
+        self._current.append(Text(data))
+
+    def handle_entityref(self, name):
+        self.handle_data(
+            '&{};'.format(name) if name not in name2codepoint
+            else _unichr(name2codepoint[name]))
+
+    def handle_charref(self, name):
+        code = int(name[1:], 16) if name.lower().startswith('x') \
+            else int(name)
+        self.handle_data(_unichr(code))
+
+
+try:
+    _unichr = unichr
+except NameError:
+    _unichr = chr
+
+
+def parse_html(html):
+    """Parse HTML to document node."""
+    parser = _Parser()
+    parser.feed(html)
+    parser.close()
+    return parser.document
+
+
+_CSS_COMPOUND = re.compile(
+    r'(?P<tag>[\w-]+|\*)?(?P<rest>(?:[#.][\w-]+|\[[^\]]+\])*)')
+_CSS_PART = re.compile(
+    r'#(?P<id>[\w-]+)|\.(?P<cls>[\w-]+)|'
+    r'\[(?P<attr>[\w-]+)(?:(?P<op>[~^$*]?=)["\']?(?P<value>[^"\'\]]*)'
+    r'["\']?)?\]')
+
+
+def css_select(root, selector):
+    """Find descendant elements matching simple css selector.
+
+    Supported are tag, id, class and attribute selectors combined with
+    descendant and child combinators, and selector groups.
+    """
+    found = []
+    for group in selector.split(','):
+        for node in _css_select_group(root, group.strip()):
+            if node not in found:
+                found.append(node)
+    return sorted(found, key=lambda node: node.order)
+
+
+def _css_select_group(root, selector):
+    tokens = selector.replace('>', ' > ').split()
+    contexts = [root]
+    child_only = False
+
+    for token in tokens:
+        if token == '>':
+            child_only = True
+            continue
+
+        matched = []
+        for context in contexts:
+            candidates = context.elements if child_only else context.iter()
+            for node in candidates:
+                if _css_match(node, token) and node not in matched:
+                    matched.append(node)
+        contexts = matched
+        child_only = False
+
+    return contexts
+
+
+def _css_match(node, compound):
+    match = _CSS_COMPOUND.match(compound)
+    if not match or match.end() != len(compound):
+        raise ValueError('Unsupported css selector {!r}'.format(compound))
+
+    tag = match.group('tag')
+    if tag and tag != '*' and node.tag != tag.lower():
+        return False
+
+    for part in _CSS_PART.finditer(match.group('rest')):
+        if part.group('id') and node.attrs.get('id') != part.group('id'):
+            return False
+        if part.group('cls') and \
+                part.group('cls') not in node.attrs.get('class', '').split():
+            return False
+        if part.group('attr'):
+            name, op, value = part.group('attr', 'op', 'value')
+            if name not in node.attrs:
+                return False
+            actual = node.attrs[name]
+            if op == '=' and actual != value or \
+                    op == '~=' and value not in actual.split() or \
+                    op == '^=' and not actual.startswith(value) or \
+                    op == '$=' and not actual.endswith(value) or \
+                    op == '*=' and value not in actual:
+                return False
+
+    return True
@@ -0,0 +1,697 @@
+"""
+Fake webdriver.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+import re
+import time
+
+from selenium.common import exceptions
+from selenium.webdriver.common.by import By
+
+from . import xpath
+from .dom import css_select, Element, parse_html
+from .. import profiling
+from ..pool import RESET_STORAGE
+from ..ui import scripts
+
+__all__ = [
+    'FakeWebDriver',
+    'FakeWebElement',
+]
+
+# Selenium < 3.4 has no JavascriptException.
+_JAVASCRIPT_ERROR = getattr(exceptions, 'JavascriptException',
+                            exceptions.WebDriverException)
+
+BLANK_URL = 'about:blank'
+
+# Python implementations of pom javascript snippets.
+SCRIPTS = {}
+
+
+def script(source):
+    """Decorator to register python implementation of javascript snippet."""
+    def wrapper(func):
+        SCRIPTS[source] = func
+        return func
+
+    return wrapper
+
+
+def find_all(root, by, value):
+    """Find elements by selenium locator inside root node."""
+    if by == By.ID:
+        return [node for node in root.iter() if node.attrs.get('id') == value]
+    if by == By.NAME:
+        return [node for node in root.iter()
+                if node.attrs.get('name') == value]
+    if by == By.CLASS_NAME:
+        return [node for node in root.iter()
+                if value in node.attrs.get('class', '').split()]
+    if by == By.TAG_NAME:
+        return [node for node in root.iter() if node.tag == value.lower()]
+    if by == By.CSS_SELECTOR:
+        return css_select(root, value)
+    if by == By.XPATH:
+        return xpath.select(value, root)
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        return [node for node in root.iter() if node.tag == 'a' and (
+            node.text == value if by == By.LINK_TEXT else value in node.text)]
+    raise exceptions.InvalidSelectorException(
+        'Unknown locator strategy {!r}'.format(by))
+
+
+def _nth(nodes, index):
+    """Node at index like ``find`` script takes it, or ``None``."""
+    index = index or 0
+    if index < 0:
+        index += len(nodes)
+    return nodes[index] if 0 <= index < len(nodes) else None
+
+
+class FakeWebElement(object):
+    """Fake web element, a handle of DOM element."""
+
+    def __init__(self, driver, node):
+        """Constructor."""
+        self.parent = driver
+        self.node = node
+
+    def __eq__(self, other):
+        """Elements are equal if they refer the same DOM element."""
+        return isinstance(other, FakeWebElement) and self.node is other.node
+
+    def __ne__(self, other):
+        """Elements aren't equal."""
+        return not self == other
+
+    def __hash__(self):
+        """Hash."""
+        return hash(self.node.uid)
+
+    def __repr__(self):
+        """Object representation."""
+        return '{}({!r})'.format(self.__class__.__name__, self.node)
+
+    def _command(self, name):
+        self.parent._command(name)
+        if self.node.root is not self.parent.document:
+            raise exceptions.StaleElementReferenceException(
+                '{!r} is not attached to the page document'.format(self.node))
+        return self.node
+
+    @property
+    def id(self):
+        """Web element id."""
+        return self.node.uid
+
+    @property
+    def tag_name(self):
+        """Tag name."""
+        return self._command('tag_name').tag
+
+    @property
+    def text(self):
+        """Visible text."""
+        return self._command('text').text
+
+    @property
+    def location(self):
+        """Location of element."""
+        node = self._command('location')
+        return {'x': 0, 'y': 10 * len(node.order)}
+
+    @property
+    def size(self):
+        """Size of element."""
+        self._command('size')
+        return {'width': 100, 'height': 10}
+
+    def find_element(self, by=By.ID, value=None):
+        """Find DOM element inside element."""
+        return self.parent._find(self._command('find_element'), by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        """Find DOM elements inside element."""
+        return self.parent._find_all(
+            self._command('find_elements'), by, value)
+
+    def is_displayed(self):
+        """Define is element displayed."""
+        return self._command('is_displayed').is_visible
+
+    def is_enabled(self):
+        """Define is element enabled."""
+        return 'disabled' not in self._command('is_enabled').attrs
+
+    def is_selected(self):
+        """Define is element selected."""
+        return _is_selected(self._command('is_selected'))
+
+    def get_attribute(self, name):
+        """Get element property or attribute."""
+        return _get_property(self._command('get_attribute'), name)
+
+    get_property = get_attribute
+
+    def click(self):
+        """Click element."""
+        node = self._command('click')
+        if not node.is_visible:
+            raise exceptions.ElementNotVisibleException(
+                '{!r} is not visible'.format(node))
+        _click(self.parent, node)
+
+    def clear(self):
+        """Clear input."""
+        self._command('clear').attrs['value'] = ''
+
+    def send_keys(self, *value):
+        """Type text to input."""
+        node = self._command('send_keys')
+        if not node.is_visible and node.attrs.get('type') != 'file':
+            raise exceptions.ElementNotVisibleException(
+                '{!r} is not visible'.format(node))
+        node.attrs['value'] = node.attrs.get('value', '') + ''.join(
+            str(v) for v in value)
+
+    def submit(self):
+        """Submit form."""
+        node = self._command('submit')
+        self.parent.submits.append(node)
+
+
+def _is_selected(node):
+    if node.tag == 'option':
+        return node in _selected_options(_select_of(node))
+    return 'checked' in node.attrs
+
+
+def _select_of(option):
+    select = option.parent
+    while select.tag != 'select':
+        select = select.parent
+    return select
+
+
+def _selected_options(select):
+    options = _options(select)
+    selected = [option for option in options if 'selected' in option.attrs]
+    # single select has the first option selected by default
+    if not selected and options and 'multiple' not in select.attrs:
+        selected = options[:1]
+    return selected
+
+
+def _options(select):
+    return [node for node in select.iter() if node.tag == 'option']
+
+
+def _get_property(node, name):
+    if name == 'innerHTML':
+        return node.inner_html
+    if name == 'outerHTML':
+        return node.serialize()
+    if name in ('textContent', 'innerText'):
+        return node.string_value
+    if name == 'value':
+        if node.tag == 'select':
+            selected = _selected_options(node)
+            return _get_property(selected[0], 'value') if selected else ''
+        if node.tag in ('textarea', 'option') and 'value' not in node.attrs:
+            return node.string_value
+        return node.attrs.get('value', '')
+    if name == 'index' and node.tag == 'option':
+        return str(_options(_select_of(node)).index(node))
+    if name in ('checked', 'selected'):
+        return 'true' if _is_selected(node) else None
+    if name in ('multiple', 'disabled', 'hidden'):
+        return 'true' if name in node.attrs else None
+    return node.attrs.get(name)
+
+
+def _click(driver, node):
+    node.clicks += 1
+
+    if node.tag == 'option':
+        select = _select_of(node)
+        if 'multiple' in select.attrs:
+            if 'selected' in node.attrs:
+                del node.attrs['selected']
+            else:
+                node.attrs['selected'] = ''
+        else:
+            for option in _options(select):
+                option.attrs.pop('selected', None)
+            node.attrs['selected'] = ''
+
+    elif node.tag == 'input' and node.attrs.get('type') in ('checkbox',
+                                                            'radio'):
+        if 'checked' in node.attrs:
+            del node.attrs['checked']
+        else:
+            node.attrs['checked'] = ''
+
+    handler = driver.on_click.get(node.attrs.get('id'))
+    if handler:
+        handler(driver, node)
+
+
+class FakeWebDriver(object):
+    """Deterministic in-process webdriver with DOM parsed from HTML.
+
+    Usage::
+
+        driver = FakeWebDriver({'http://app/': '<button id="ok">'})
+        driver.get('http://app/')
+        app = MyApp('http://app', lambda: driver)
+        ...
+        assert driver.commands['is_displayed'] == 1
+
+    Arguments:
+        - pages: dict, url to HTML of page.
+        - latency: float, seconds of every command, or dict of seconds per
+          command name.
+
+    Every webdriver request is counted in ``commands``, executed pom scripts
+    are counted in ``scripts`` by names of their python implementations,
+    e.g. ``table_snapshot``. DOM is available
+    in ``document`` to change it during test: hide, show, replace (to make
+    found web elements stale) or remove its elements. Events fired by
+    scripts are recorded in ``events`` as ``(element, event type)``.
+    Callbacks of ``on_scroll`` are called with driver and element scrolled
+    into view by scripts, e.g. to emulate virtualized rows.
+    """
+
+    w3c = False
+
+    def __init__(self, pages=None, latency=0):
+        """Constructor."""
+        self.pages = dict(pages or {})
+        self.latency = latency
+        self.commands = collections.Counter()
+        self.scripts = collections.Counter()
+        self.on_click = {}
+        self.submits = []
+        self.events = []
+        self.on_scroll = []
+        self.script_timeout = 30
+        self.current_url = BLANK_URL
+        self._history = [BLANK_URL]
+        self._position = 0
+        self.document = parse_html('')
+
+    @property
+    def command_count(self):
+        """Total number of requests to webdriver."""
+        return sum(self.commands.values())
+
+    def reset_commands(self):
+        """Reset counters of requests."""
+        self.commands.clear()
+        self.scripts.clear()
+
+    def query(self, selector):
+        """Find DOM elements by css selector, it isn't counted as request."""
+        return css_select(self.document, selector)
+
+    def load(self, html):
+        """Replace DOM of current page."""
+        self.document = parse_html(html)
+
+    def _command(self, name):
+        self.commands[name] += 1
+        profiling.count_command()
+        latency = self.latency.get(name, 0) \
+            if isinstance(self.latency, dict) else self.latency
+        if latency:
+            time.sleep(latency)
+
+    def _navigate(self, url):
+        self.current_url = url
+        html = self.pages.get(url)
+        if html is None:
+            html = self.pages.get(url.split('?')[0].split('#')[0], '')
+        self.load(html)
+
+    def _find(self, root, by, value):
+        nodes = find_all(root, by, value)
+        if not nodes:
+            raise exceptions.NoSuchElementException(
+                'Unable to locate element: {!r}'.format((by, value)))
+        return FakeWebElement(self, nodes[0])
+
+    def _find_all(self, root, by, value):
+        return [FakeWebElement(self, node)
+                for node in find_all(root, by, value)]
+
+    def execute(self, command, params=None):
+        """Execute raw webdriver command, used by action chains."""
+        self._command(command)
+        return {'value': None}
+
+    def get(self, url):
+        """Open url."""
+        self._command('get')
+        del self._history[self._position + 1:]
+        self._history.append(url)
+        self._position += 1
+        self._navigate(url)
+
+    def refresh(self):
+        """Refresh page."""
+        self._command('refresh')
+        self._navigate(self.current_url)
+
+    def back(self):
+        """Back."""
+        self._command('back')
+        self._position = max(self._position - 1, 0)
+        self._navigate(self._history[self._position])
+
+    def forward(self):
+        """Forward."""
+        self._command('forward')
+        self._position = min(self._position + 1, len(self._history) - 1)
+        self._navigate(self._history[self._position])
+
+    def quit(self):
+        """Close browser."""
+        self._command('quit')
+
+    def delete_all_cookies(self):
+        """Delete cookies."""
+        self._command('delete_all_cookies')
+
+    def set_script_timeout(self, seconds):
+        """Set timeout of async scripts."""
+        self._command('set_script_timeout')
+        self.script_timeout = seconds
+
+    def find_element(self, by=By.ID, value=None):
+        """Find DOM element."""
+        self._command('find_element')
+        return self._find(self.document, by, value)
+
+    def find_elements(self, by=By.ID, value=None):
+        """Find DOM elements."""
+        self._command('find_elements')
+        return self._find_all(self.document, by, value)
+
+    def execute_script(self, source, *args):
+        """Execute javascript snippet of pom."""
+        self._command('execute_script')
+        return self._execute_script(source, args)
+
+    def execute_async_script(self, source, *args):
+        """Execute async javascript snippet of pom."""
+        self._command('execute_async_script')
+        return self._execute_script(source, args)
+
+    def _execute_script(self, source, args):
+        if source.startswith('window.scroll'):
+            return None
+        try:
+            func = SCRIPTS[source]
+        except KeyError:
+            raise _JAVASCRIPT_ERROR(
+                "Fake webdriver can't execute script:\n{}".format(source))
+        self.scripts[func.__name__.lstrip('_')] += 1
+        return self._wrap(func(self, *[self._unwrap(arg) for arg in args]))
+
+    def _unwrap(self, value):
+        if isinstance(value, FakeWebElement):
+            if value.node.root is not self.document:
+                raise exceptions.StaleElementReferenceException(
+                    '{!r} is not attached to the page document'.format(
+                        value.node))
+            return value.node
+        if isinstance(value, (list, tuple)):
+            return [self._unwrap(item) for item in value]
+        return value
+
+    def _wrap(self, value):
+        if isinstance(value, Element):
+            return FakeWebElement(self, value)
+        if isinstance(value, (list, tuple)):
+            return [self._wrap(item) for item in value]
+        if isinstance(value, dict):
+            return dict((key, self._wrap(item))
+                        for key, item in value.items())
+        return value
+
+
+@script(RESET_STORAGE)
+def _reset_storage(driver):
+    return None
+
+
+@script(scripts.TABLE_SNAPSHOT)
+def _table_snapshot(driver, root, row_xpath, cell_xpath, with_texts=False):
+    data = []
+    for index, row in enumerate(xpath.select(row_xpath,
+                                             root or driver.document)):
+        if row.is_visible:
+            cells = xpath.select(cell_xpath, row)
+            data.append([index, [
+                cell.inner_html.strip() if cell.is_visible else None
+                for cell in cells]])
+            if with_texts:
+                data[-1].append([cell.string_value if cell.is_visible
+                                 else None for cell in cells])
+    return data
+
+
+@script(scripts.SCROLL_ROWS)
+def _scroll_rows(driver, root, row_xpath, cell_xpath, scroll, timeout):
+    rows = xpath.select(row_xpath, root or driver.document)
+    if scroll and rows:
+        for callback in driver.on_scroll:
+            callback(driver, rows[-1])
+    return _table_snapshot(driver, root, row_xpath, cell_xpath, True)
+
+
+@script(scripts.CELL_TEXTS)
+def _cell_texts(driver, root, cell_xpath):
+    return [re.sub(r'\s+', ' ', cell.string_value).strip()
+            for cell in xpath.select(cell_xpath, root or driver.document)]
+
+
+@script(scripts.ROWS_WINDOW)
+def _rows_window(driver, root, row_xpath, start, count):
+    rows = xpath.select(row_xpath, root or driver.document)
+    return [[i for i in range(start, min(start + count, len(rows)))
+             if rows[i].is_visible], len(rows)]
+
+
+@script(scripts.FIND_VISIBLE)
+def _find_visible(driver, root, by, value):
+    found = find_all(root or driver.document, by, value)
+    indexes = [i for i, node in enumerate(found) if node.is_visible]
+    return [indexes, [found[i] for i in indexes]]
+
+
+@script(scripts.FIND_CHAIN)
+def _find_chain(driver, root, chain):
+    node = root or driver.document
+    for i, (by, value, index) in enumerate(chain):
+        nodes = find_all(node, by, value)
+        node = _nth(nodes, index)
+        if node is None or i < len(chain) - 1 and not node.is_visible:
+            return i
+    return node
+
+
+@script(scripts.WAIT_FOR_VISIBILITY)
+def _wait_for_visibility(driver, root, by, value, index, timeout, presence):
+    if timeout / 1000.0 > driver.script_timeout:
+        time.sleep(driver.script_timeout)
+        raise exceptions.TimeoutException('Script timeout')
+
+    def check():
+        nodes = find_all(root or driver.document, by, value)
+        node = _nth(nodes, index)
+        return (node is not None and node.is_visible) == presence
+
+    limit = time.time() + timeout / 1000.0
+    while not check():
+        if time.time() >= limit:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+@script(scripts.SET_VALUES)
+def _set_values(driver, root, fields):
+    failed = []
+    for i, (by, value, index, kind, field_value) in enumerate(fields):
+        nodes = find_all(root or driver.document, by, value)
+        node = _nth(nodes, index)
+        if node is None or not node.is_visible or 'disabled' in node.attrs:
+            failed.append(i)
+        elif kind == 'select':
+            if not _select(driver, node, *field_value):
+                failed.append(i)
+        elif 'readonly' in node.attrs:
+            failed.append(i)
+        else:
+            node.attrs['value'] = str(field_value)
+            driver.events.extend([(node, 'input'), (node, 'change')])
+    return failed
+
+
+def _read_value(node, kind):
+    if kind == 'text':
+        return node.text
+    if kind == 'value':
+        return _get_property(node, 'value')
+    if kind == 'text_or_value':
+        return node.text or _get_property(node, 'value')
+    if kind == 'select':
+        selected = _selected_options(node)
+        return selected[0].inner_html.strip() if selected else ''
+    if kind == 'checked':
+        return 'checked' in node.attrs
+    raise _JAVASCRIPT_ERROR(
+        'Unknown value kind: {}'.format(kind))
+
+
+@script(scripts.READ_VALUES)
+def _read_values(driver, root, uis, states):
+    def read(root, uis):
+        result = {}
+        for name, by, value, index, kind, children in uis:
+            nodes = find_all(root, by, value) if root else []
+            node = _nth(nodes, index)
+            present = node is not None and node.is_visible
+            if children:
+                result[name] = read(node if present else None, children)
+                continue
+
+            value = _read_value(node, kind) if kind and present else None
+            if states:
+                result[name] = {'is_present': present,
+                                'is_enabled': present and
+                                'disabled' not in node.attrs}
+                if kind:
+                    result[name]['value'] = value
+            elif kind:
+                result[name] = value
+        return result
+
+    return read(root or driver.document, uis)
+
+
+@script(scripts.OPTION_TEXTS)
+def _option_texts(driver, select):
+    return [option.inner_html.strip() for option in _options(select)]
+
+
+@script(scripts.SELECTED_OPTION_TEXTS)
+def _selected_option_texts(driver, select):
+    return [option.inner_html.strip()
+            for option in _selected_options(select)]
+
+
+@script(scripts.SELECT_OPTIONS)
+def _select_options(driver, select, count, wanted):
+    options = _options(select)
+    texts = [option.inner_html.strip() for option in options]
+    for indexes, text in wanted:
+        if len(options) != count or indexes[0] >= len(options) or \
+                texts[indexes[0]] != text:
+            return texts
+
+    selected = _selected_options(select)
+    chosen = []
+    for indexes, _ in wanted:
+        chosen.append(next((i for i in indexes if options[i] in selected),
+                           indexes[0]))
+
+    if 'multiple' not in select.attrs:
+        chosen = chosen[:1]
+    changed = False
+    for i, option in enumerate(options):
+        if (option in selected) != (i in chosen):
+            changed = True
+        option.attrs.pop('selected', None)
+        if i in chosen:
+            option.attrs['selected'] = ''
+
+    if changed:
+        driver.events.extend([(select, 'input'), (select, 'change')])
+    return None
+
+
+@script(scripts.BATCH)
+def _batch(driver, root, actions):
+    for position, (chain, kind, arg) in enumerate(actions):
+        node = root or driver.document
+        for by, value, index in chain:
+            nodes = find_all(node, by, value)
+            node = _nth(nodes, index)
+            if node is None or not node.is_visible:
+                return position
+
+        if kind == 'click':
+            _click(driver, node)
+            continue
+        if 'disabled' in node.attrs or kind not in ('check', 'text',
+                                                    'select'):
+            return position
+
+        if kind == 'check':
+            if ('checked' in node.attrs) != arg:
+                _click(driver, node)
+        elif kind == 'text':
+            if 'readonly' in node.attrs:
+                return position
+            node.attrs['value'] = str(arg)
+            driver.events.extend([(node, 'input'), (node, 'change')])
+        elif not _select(driver, node, *arg):
+            return position
+    return -1
+
+
+def _select(driver, select, values, match):
+    options = _options(select)
+    texts = [option.inner_html.strip() for option in options]
+    selected = _selected_options(select)
+    chosen = []
+    for value in values:
+        matched = [i for i, text in enumerate(texts)
+                   if (text == value if match == 'exact' else value in text)]
+        if not matched:
+            return False
+        chosen.append(next((i for i in matched if options[i] in selected),
+                           matched[0]))
+
+    if 'multiple' not in select.attrs:
+        chosen = chosen[:1]
+    changed = False
+    for i, option in enumerate(options):
+        if (option in selected) != (i in chosen):
+            changed = True
+        option.attrs.pop('selected', None)
+        if i in chosen:
+            option.attrs['selected'] = ''
+
+    if changed:
+        driver.events.extend([(select, 'input'), (select, 'change')])
+    return True
@@ -0,0 +1,502 @@
+"""
+XPath 1.0 evaluator of fake webdriver.
+
+Supports location paths with all common axes, predicates, operators and
+core functions, which is enough for locators of ui elements.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import re
+
+from .dom import Element, Text
+
+_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<number>\d+(?:\.\d*)?|\.\d+)
+      | (?P<string>"[^"]*"|'[^']*')
+      | (?P<op>//|::|!=|<=|>=|\.\.|[/()\[\]@,|=<>+\-*.])
+      | (?P<name>[A-Za-z_][\w.-]*(?:-[\w.]+)*)
+    )''', re.X)
+
+_REVERSE_AXES = {'ancestor', 'ancestor-or-self', 'parent',
+                 'preceding-sibling', 'preceding'}
+_NODE_TYPES = {'node', 'text'}
+_OPERATOR_NAMES = {'and', 'or', 'div', 'mod'}
+
+
+class XPathError(ValueError):
+    """Unsupported or invalid xpath."""
+
+
+def evaluate(xpath, context):
+    """Evaluate xpath against context node."""
+    parser = _Parser(xpath)
+    ast = parser.parse()
+    return _eval(ast, context, 1, 1)
+
+
+def select(xpath, context):
+    """Find elements by xpath."""
+    result = evaluate(xpath, context)
+    if not isinstance(result, list):
+        raise XPathError('{!r} is not a node-set'.format(xpath))
+    return [node for node in result if isinstance(node, Element)]
+
+
+def _tokenize(xpath):
+    tokens = []
+    pos = 0
+    xpath = xpath.strip()
+    while pos < len(xpath):
+        match = _TOKEN.match(xpath, pos)
+        if not match or match.end() == pos:
+            raise XPathError('Invalid xpath {!r} at {}'.format(xpath, pos))
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+
+        # "*" and operator names are operators only after operand
+        if kind in ('op', 'name') and value in _OPERATOR_NAMES | {'*'}:
+            previous = tokens[-1] if tokens else None
+            if previous and not (
+                    previous[0] == 'op' and previous[1] in
+                    ('@', '::', '(', '[', ',', '/', '//', '|', '=', '!=',
+                     '<', '<=', '>', '>=', '+', '-', '*') or
+                    previous[0] == 'operator'):
+                kind = 'operator'
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser(object):
+
+    def __init__(self, xpath):
+        self.xpath = xpath
+        self.tokens = _tokenize(xpath)
+        self.pos = 0
+
+    def parse(self):
+        ast = self.expr()
+        if self.pos != len(self.tokens):
+            raise XPathError('Unexpected {!r} in {!r}'.format(
+                self.peek()[1], self.xpath))
+        return ast
+
+    def peek(self, offset=0):
+        index = self.pos + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        token = self.peek()
+        if value is not None and token[1] != value:
+            raise XPathError('Expected {!r} in {!r}'.format(value, self.xpath))
+        self.pos += 1
+        return token
+
+    def binary(self, operand, operators):
+        left = operand()
+        while self.peek()[1] in operators and \
+                self.peek()[0] in ('op', 'operator'):
+            operator = self.take()[1]
+            left = ('binary', operator, left, operand())
+        return left
+
+    def expr(self):
+        return self.binary(self.and_expr, ('or',))
+
+    def and_expr(self):
+        return self.binary(self.equality, ('and',))
+
+    def equality(self):
+        return self.binary(self.relational, ('=', '!='))
+
+    def relational(self):
+        return self.binary(self.additive, ('<', '<=', '>', '>='))
+
+    def additive(self):
+        return self.binary(self.multiplicative, ('+', '-'))
+
+    def multiplicative(self):
+        left = self.unary()
+        while self.peek()[0] == 'operator' and \
+                self.peek()[1] in ('*', 'div', 'mod'):
+            operator = self.take()[1]
+            left = ('binary', operator, left, self.unary())
+        return left
+
+    def unary(self):
+        if self.peek()[1] == '-':
+            self.take()
+            return ('negate', self.unary())
+        return self.union()
+
+    def union(self):
+        left = self.path()
+        while self.peek()[1] == '|':
+            self.take()
+            left = ('union', left, self.path())
+        return left
+
+    def path(self):
+        kind, value = self.peek()
+        is_primary = kind in ('number', 'string') or value == '(' or (
+            kind == 'name' and self.peek(1)[1] == '(' and
+            value not in _NODE_TYPES)
+
+        if not is_primary:
+            return self.location_path()
+
+        node = self.primary()
+        predicates = self.predicates()
+        if predicates:
+            node = ('filter', node, predicates)
+
+        steps = []
+        while self.peek()[1] in ('/', '//'):
+            if self.take()[1] == '//':
+                steps.append(('descendant-or-self', 'node()', []))
+            steps.append(self.step())
+        if steps:
+            node = ('path', node, steps)
+        return node
+
+    def primary(self):
+        kind, value = self.take()
+        if kind == 'number':
+            return ('literal', float(value))
+        if kind == 'string':
+            return ('literal', value[1:-1])
+        if value == '(':
+            node = self.expr()
+            self.take(')')
+            return node
+
+        self.take('(')
+        args = []
+        while self.peek()[1] != ')':
+            args.append(self.expr())
+            if self.peek()[1] == ',':
+                self.take()
+        self.take(')')
+        return ('call', value, args)
+
+    def location_path(self):
+        steps = []
+        start = None
+
+        if self.peek()[1] in ('/', '//'):
+            start = 'root'
+            if self.take()[1] == '//':
+                steps.append(('descendant-or-self', 'node()', []))
+            elif not self._is_step_start():
+                return ('path', ('root',), [])
+
+        steps.append(self.step())
+        while self.peek()[1] in ('/', '//'):
+            if self.take()[1] == '//':
+                steps.append(('descendant-or-self', 'node()', []))
+            steps.append(self.step())
+
+        return ('path', ('root',) if start else ('context',), steps)
+
+    def _is_step_start(self):
+        kind, value = self.peek()
+        return kind == 'name' or value in ('.', '..', '@', '*')
+
+    def step(self):
+        kind, value = self.peek()
+        if value == '.':
+            self.take()
+            return ('self', 'node()', [])
+        if value == '..':
+            self.take()
+            return ('parent', 'node()', [])
+
+        axis = 'child'
+        if value == '@':
+            self.take()
+            axis = 'attribute'
+        elif kind == 'name' and self.peek(1)[1] == '::':
+            axis = self.take()[1]
+            self.take('::')
+
+        kind, value = self.take()
+        if value == '*' or kind in ('name', 'operator'):
+            test = value
+            if value in _NODE_TYPES and self.peek()[1] == '(':
+                self.take('(')
+                self.take(')')
+                test = value + '()'
+        else:
+            raise XPathError('Unexpected {!r} in {!r}'.format(
+                value, self.xpath))
+
+        return (axis, test, self.predicates())
+
+    def predicates(self):
+        predicates = []
+        while self.peek()[1] == '[':
+            self.take()
+            predicates.append(self.expr())
+            self.take(']')
+        return predicates
+
+
+class _Attr(object):
+
+    def __init__(self, name, value, parent):
+        self.name = name
+        self.string_value = value
+        self.parent = parent
+
+    @property
+    def order(self):
+        return self.parent.order + (-1,)
+
+
+def _order(node):
+    if isinstance(node, Element) or isinstance(node, _Attr):
+        return node.order
+    return node.parent.order + (node.parent.children.index(node),)
+
+
+def _document_order(nodes):
+    unique = []
+    seen = set()
+    for node in nodes:
+        if id(node) not in seen:
+            seen.add(id(node))
+            unique.append(node)
+    return sorted(unique, key=_order)
+
+
+def _axis(node, axis):
+    if axis == 'child':
+        return list(getattr(node, 'children', []))
+    if axis == 'self':
+        return [node]
+    if axis == 'parent':
+        return [node.parent] if node.parent is not None else []
+    if axis == 'attribute':
+        if not isinstance(node, Element):
+            return []
+        return [_Attr(name, value, node)
+                for name, value in sorted(node.attrs.items())]
+    if axis in ('descendant', 'descendant-or-self'):
+        nodes = [node] if axis == 'descendant-or-self' else []
+        for child in getattr(node, 'children', []):
+            nodes.extend(_axis(child, 'descendant-or-self'))
+        return nodes
+    if axis in ('ancestor', 'ancestor-or-self'):
+        nodes = [node] if axis == 'ancestor-or-self' else []
+        parent = node.parent
+        while parent is not None:
+            nodes.append(parent)
+            parent = parent.parent
+        return nodes
+    if axis in ('following-sibling', 'preceding-sibling'):
+        if node.parent is None:
+            return []
+        siblings = node.parent.children
+        index = siblings.index(node)
+        if axis == 'following-sibling':
+            return siblings[index + 1:]
+        return list(reversed(siblings[:index]))
+    raise XPathError('Unsupported axis {!r}'.format(axis))
+
+
+def _test(node, test):
+    if test == 'node()':
+        return True
+    if test == 'text()':
+        return isinstance(node, Text)
+    if isinstance(node, _Attr):
+        return test == '*' or node.name == test
+    if not isinstance(node, Element):
+        return False
+    return test == '*' or node.tag == test.lower()
+
+
+def _filter(nodes, predicates):
+    for predicate in predicates:
+        size = len(nodes)
+        filtered = []
+        for position, node in enumerate(nodes, 1):
+            result = _eval(predicate, node, position, size)
+            if isinstance(result, float):
+                result = result == position
+            else:
+                result = _boolean(result)
+            if result:
+                filtered.append(node)
+        nodes = filtered
+    return nodes
+
+
+def _steps(nodes, steps):
+    for axis, test, predicates in steps:
+        result = []
+        for node in nodes:
+            candidates = [candidate for candidate in _axis(node, axis)
+                          if _test(candidate, test)]
+            result.extend(_filter(candidates, predicates))
+        nodes = _document_order(result)
+    return nodes
+
+
+def _string(value):
+    if isinstance(value, list):
+        return value[0].string_value if value else ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float):
+        return str(int(value)) if value == int(value) else str(value)
+    return value
+
+
+def _number(value):
+    if isinstance(value, float):
+        return value
+    try:
+        return float(_string(value).strip())
+    except ValueError:
+        return float('nan')
+
+
+def _boolean(value):
+    if isinstance(value, list):
+        return bool(value)
+    if isinstance(value, float):
+        return value != 0 and value == value
+    return bool(value)
+
+
+def _compare(operator, left, right):
+    if isinstance(left, list) or isinstance(right, list):
+        lefts = [node.string_value for node in left] \
+            if isinstance(left, list) else [left]
+        rights = [node.string_value for node in right] \
+            if isinstance(right, list) else [right]
+        return any(_compare(operator, l, r) for l in lefts for r in rights)
+
+    if operator in ('=', '!='):
+        if isinstance(left, bool) or isinstance(right, bool):
+            left, right = _boolean(left), _boolean(right)
+        elif isinstance(left, float) or isinstance(right, float):
+            left, right = _number(left), _number(right)
+        return (left == right) == (operator == '=')
+
+    left, right = _number(left), _number(right)
+    return {'<': left < right, '<=': left <= right,
+            '>': left > right, '>=': left >= right}[operator]
+
+
+_ARITHMETIC = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    'div': lambda a, b: a / b if b else float('nan'),
+    'mod': lambda a, b: a % b if b else float('nan'),
+}
+
+
+def _eval(ast, context, position, size):
+    kind = ast[0]
+
+    if kind == 'literal':
+        return ast[1]
+
+    if kind == 'context':
+        return [context]
+
+    if kind == 'root':
+        return [context.root if isinstance(context, Element)
+                else context.parent.root]
+
+    if kind == 'path':
+        nodes = _eval(ast[1], context, position, size)
+        if not isinstance(nodes, list):
+            raise XPathError('Path step applied to non node-set')
+        return _steps(nodes, ast[2])
+
+    if kind == 'filter':
+        nodes = _eval(ast[1], context, position, size)
+        return _filter(_document_order(nodes), ast[2])
+
+    if kind == 'union':
+        return _document_order(_eval(ast[1], context, position, size) +
+                               _eval(ast[2], context, position, size))
+
+    if kind == 'negate':
+        return -_number(_eval(ast[1], context, position, size))
+
+    if kind == 'binary':
+        operator = ast[1]
+        if operator == 'or':
+            return _boolean(_eval(ast[2], context, position, size)) or \
+                _boolean(_eval(ast[3], context, position, size))
+        if operator == 'and':
+            return _boolean(_eval(ast[2], context, position, size)) and \
+                _boolean(_eval(ast[3], context, position, size))
+
+        left = _eval(ast[2], context, position, size)
+        right = _eval(ast[3], context, position, size)
+        if operator in _ARITHMETIC:
+            return _ARITHMETIC[operator](_number(left), _number(right))
+        return _compare(operator, left, right)
+
+    if kind == 'call':
+        return _call(ast[1], [_eval(arg, context, position, size)
+                              for arg in ast[2]], context, position, size)
+
+    raise XPathError('Unknown expression {!r}'.format(ast))
+
+
+def _call(name, args, context, position, size):
+    if name == 'position':
+        return float(position)
+    if name == 'last':
+        return float(size)
+    if name == 'count':
+        return float(len(args[0]))
+    if name == 'string':
+        return _string(args[0] if args else [context])
+    if name == 'number':
+        return _number(args[0] if args else [context])
+    if name == 'boolean':
+        return _boolean(args[0])
+    if name == 'not':
+        return not _boolean(args[0])
+    if name == 'true':
+        return True
+    if name == 'false':
+        return False
+    if name == 'concat':
+        return ''.join(_string(arg) for arg in args)
+    if name == 'contains':
+        return _string(args[1]) in _string(args[0])
+    if name == 'starts-with':
+        return _string(args[0]).startswith(_string(args[1]))
+    if name == 'string-length':
+        return float(len(_string(args[0] if args else [context])))
+    if name == 'normalize-space':
+        return ' '.join(_string(args[0] if args else [context]).split())
+    if name in ('name', 'local-name'):
+        nodes = args[0] if args else [context]
+        return getattr(nodes[0], 'tag', getattr(nodes[0], 'name', '')) \
+            if nodes else ''
+    raise XPathError('Unsupported function {!r}'.format(name))
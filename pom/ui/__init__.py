@@ -17,11 +17,13 @@ POM UI components.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .base import Block, Container, register_ui, UI, wait_for_presence  # noqa
+from .base import (Block, Container, navigates, register_ui, UI,  # noqa
+                   wait_for_presence)
+from .batch import Batch, batched  # noqa
 from .button import Button  # noqa
 from .checkbox import CheckBox  # noqa
 from .combobox import ComboBox  # noqa
 from .form import Form  # noqa
 from .link import Link  # noqa
-from .table import List, Row, Table  # noqa
+from .table import List, Row, RowData, Table, VirtualTable  # noqa
 from .fields import FileField, IntegerField, TextField  # noqa
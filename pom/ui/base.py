@@ -17,27 +17,71 @@ Base UI element.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import functools
 import logging
+import time
+import weakref
+
 import six
 
 from selenium.common import exceptions
 from selenium.webdriver import ActionChains
 from waiting import TimeoutExpired, wait
 
+from . import scripts
+from .batch import batched
 from ..utils import cache, timeit
 
 LOGGER = logging.getLogger(__name__)
 PRESENCE_ERRORS = (exceptions.StaleElementReferenceException,
                    exceptions.NoSuchElementException)
+# Selenium < 3.4 has no ElementNotInteractableException.
+VISIBILITY_ERRORS = PRESENCE_ERRORS + (
+    exceptions.ElementNotVisibleException,
+    getattr(exceptions, 'ElementNotInteractableException',
+            exceptions.ElementNotVisibleException))
+
+# Counters of webdriver requests made to wait ui elements.
+STATS = collections.Counter()
+# Webdrivers which can't execute observer script (legacy drivers with zero
+# async script timeout, etc), they are polled at once.
+_NO_OBSERVER = weakref.WeakSet()
 
 
 def wait_for_presence(func):
     """Decorator to wait for ui element will be present at display."""
     @functools.wraps(func)
     def wrapper(self, *args, **kwgs):
-        self.wait_for_presence()
-        return func(self, *args, **kwgs)
+        if not self._is_presence_fresh:
+            self.wait_for_presence()
+            return func(self, *args, **kwgs)
+
+        STATS['presence_elided'] += 1
+        try:
+            return func(self, *args, **kwgs)
+        except VISIBILITY_ERRORS:
+            # presence was verified recently, but ui element has gone
+            self.webelement._verified = None
+            self.wait_for_presence()
+            return func(self, *args, **kwgs)
+
+    return wrapper
+
+
+def navigates(func):
+    """Decorator to mark ui action which leads browser to other page.
+
+    After action DOM elements found before are treated as outdated.
+    """
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwgs):
+        try:
+            return func(self, *args, **kwgs)
+        finally:
+            app = self.app
+            if app is not None:
+                app.navigated()
 
     return wrapper
 
@@ -54,14 +98,24 @@ def register_ui(**ui):
 class Container(object):
     """Container, base class."""
 
+    __slots__ = ()
+
+    # Ui elements registered at class level, by names in order.
+    _registered_ui = collections.OrderedDict()
+
     @classmethod
     def register_ui(cls, **ui):
         """Register ui elements.
 
         Sets ui elements as cached properties. Inside property it clones ui
-        element to provide safe-thread execution.
+        element, so ui elements registered at class level are never bound
+        to containers and can be shared among threads.
         """
+        if '_registered_ui' not in cls.__dict__:
+            cls._registered_ui = collections.OrderedDict(cls._registered_ui)
+
         for ui_name, ui_obj in six.iteritems(ui):
+            cls._registered_ui[ui_name] = ui_obj
 
             def ui_getter(self, ui_obj=ui_obj):
                 ui_clone = ui_obj.clone()
@@ -88,29 +142,161 @@ class Container(object):
         """Find DOM elements inside container."""
         return self.webelement.find_elements(*locator)
 
+    @timeit
+    def find_visible_elements(self, locator, indexes=False):
+        """Find visible DOM elements inside container with one script.
+
+        Arguments:
+            - locator: tuple, (by, value) of elements.
+            - indexes: bool, return pairs of element position among all
+              found elements and element.
+
+        Returns:
+            - list: visible web elements or (index, web element) pairs.
+        """
+        positions, elements = self.execute_script(
+            scripts.FIND_VISIBLE, locator[0], locator[1])
+        if indexes:
+            return list(zip(positions, elements))
+        return elements
+
+    def execute_script(self, script, *args):
+        """Execute javascript with container DOM element as first argument.
+
+        For page the first argument is ``null``.
+        """
+        args = [arg._webelement() if isinstance(arg, WebElementProxy) else arg
+                for arg in args]
+        return self.webdriver.execute_script(script, self._script_root, *args)
+
+    def execute_async_script(self, script, *args):
+        """Execute async javascript with container DOM element as first
+        argument.
+        """
+        args = [arg._webelement() if isinstance(arg, WebElementProxy) else arg
+                for arg in args]
+        return self.webdriver.execute_async_script(
+            script, self._script_root, *args)
+
+    @timeit
+    def set_values(self, values):
+        """Set values of registered ui elements.
+
+        Values of text fields and comboboxes are set with one script, which
+        fires ``input`` and ``change`` events. Ui elements flagged with
+        ``needs_keystrokes``, ui elements without script setter and ones
+        which script failed to set (absent, hidden, disabled) get values
+        one by one after that.
+
+        Arguments:
+            - values: dict, ui element name to value.
+        """
+        values, scripted, fields = self._scripted_values(values)
+        done = set()
+
+        if scripted:
+            failed = self.execute_script(scripts.SET_VALUES, fields)
+            done = set(scripted) - set(scripted[j] for j in failed)
+
+        for i, (ui_obj, value) in enumerate(values):
+            if i not in done:
+                ui_obj.value = value
+
+    def _scripted_values(self, values):
+        """Ui elements with values and fields of values setter script.
+
+        Returns:
+            - tuple: list of (ui element, value), indexes of ones set with
+              script and their fields of script.
+        """
+        values = [(getattr(self, name), value)
+                  for name, value in six.iteritems(values)]
+        scripted, fields = [], []
+        for i, (ui_obj, value) in enumerate(values):
+            if not getattr(ui_obj, 'value_script', None) or \
+                    ui_obj.needs_keystrokes or ui_obj.container is not self:
+                continue
+            script_value = ui_obj._script_value(value)
+            if script_value is not None:
+                scripted.append(i)
+                fields.append(list(ui_obj.locator) + [
+                    ui_obj.index, ui_obj.value_script, script_value])
+        return values, scripted, fields
+
+    @timeit
+    def read_values(self, states=False):
+        """Read values of registered ui elements with one script.
+
+        Blocks with registered ui elements are read to nested dicts. Values
+        of absent or hidden ui elements are ``None``.
+
+        Arguments:
+            - states: bool, read ``{'is_present': .., 'is_enabled': ..,
+              'value': ..}`` of every ui element instead of values only.
+
+        Returns:
+            - dict: ui element name to value or state.
+        """
+        return self.execute_script(scripts.READ_VALUES, self._read_entries(),
+                                   states)
+
+    def _read_entries(self):
+        entries = []
+        for name in self._registered_ui:
+            ui_obj = getattr(self, name)
+            children = None
+            if isinstance(ui_obj, Container) and ui_obj._registered_ui:
+                children = ui_obj._read_entries()
+            entries.append([name] + list(ui_obj.locator) + [
+                ui_obj.index, ui_obj.value_reader, children])
+        return entries
+
+    @property
+    def _script_root(self):
+        return None
+
 
 class WebElementProxy(object):
     """Web element proxy is used to catch exceptions with webelement."""
 
-    def __init__(self, webelement_getter, ui_info):
-        """Constructor."""
+    __slots__ = ('_webelement_getter', '_cached_webelement', '_ui_info',
+                 '_verified')
+
+    def __init__(self, webelement_getter, ui_info, webelement=None):
+        """Constructor.
+
+        Arguments:
+            - webelement_getter: callable, finds web element.
+            - ui_info: string, ui element representation for logs.
+            - webelement: WebElement, already found web element, optional.
+        """
         self._webelement_getter = webelement_getter
-        self._cached_webelement = None
+        self._cached_webelement = webelement
         self._ui_info = ui_info
+        self._verified = None  # (generation, time) of visibility check
+
+    def _webelement(self):
+        """Get original web element."""
+        self._cached_webelement = self._cached_webelement or \
+            self._webelement_getter()
+        return self._cached_webelement
+
+    def _flush(self):
+        """Flush cached web element."""
+        LOGGER.warn("{} isn't present in DOM. Cache is flushed.".format(
+            self._ui_info))
+        self._cached_webelement = None
+        self._verified = None
 
     def __getattr__(self, name):
         """Execute web element methods and properties."""
         def webelement_attr(self=self):
-            self._cached_webelement = self._cached_webelement or \
-                self._webelement_getter()
-            return getattr(self._cached_webelement, name)
+            return getattr(self._webelement(), name)
 
         try:
             result = webelement_attr()
         except PRESENCE_ERRORS:
-            LOGGER.warn("{} isn't present in DOM. Cache is flushed.".format(
-                self._ui_info))
-            self._cached_webelement = None
+            self._flush()
             result = webelement_attr()
 
         if not callable(result):
@@ -120,20 +306,39 @@ class WebElementProxy(object):
             try:
                 return result(*args, **kwgs)
             except PRESENCE_ERRORS:
-                LOGGER.warn(
-                    "{} isn't present in DOM. Cache is flushed.".format(
-                        self._ui_info))
-                self._cached_webelement = None
+                self._flush()
                 return webelement_attr()(*args, **kwgs)
 
         return method
 
 
 class UI(object):
-    """Base class of ui element."""
+    """Base class of ui element.
+
+    Library ui elements have ``__slots__`` to be lean in big tables. Their
+    settings (``timeout``, etc) can be assigned to instances still, instance
+    ``__dict__`` is created only then.
+    """
+
+    # Frequent results are cached in own slots, others in ``_cache``.
+    __slots__ = ('locator', 'index', 'container', '_cache', '_repr',
+                 '_webelement_cache', '__dict__')
 
-    container = None
     timeout = 10
+    # "observe" waits with in-page MutationObserver, "poll" polls webdriver.
+    wait_strategy = 'observe'
+    # Observer script duration should be less than webdriver script timeout.
+    observe_slice = 2
+    # Polling sleep seconds: (initial, max, multiplier).
+    poll_interval = (0.05, 0.5, 1.5)
+    # Seconds to trust last visibility check before action, 0 to disable.
+    presence_ttl = 0
+    # Kind of value setter in bulk script, see ``Container.set_values``.
+    value_script = None
+    # Kind of value reader in bulk script, see ``Container.read_values``.
+    value_reader = None
+    # Value should be typed with real keystrokes, not set with script.
+    needs_keystrokes = False
 
     def __init__(self, *locator, **index):
         """Constructor.
@@ -143,15 +348,21 @@ class UI(object):
         """
         self.locator = locator
         self.index = index.get('index')
+        self.container = None
+        self._repr = None
+        self._webelement_cache = None  # (generation, web element proxy)
 
-    @cache
     def __repr__(self):
         """Object representation."""
-        return self.__class__.__name__ + \
-            '(by={!r}'.format(self.locator[0]) + \
-            ', value={!r}'.format(self.locator[1]) + \
-            (')' if self.index is None else ', index={})'.format(self.index))
-
+        if self._repr is None:
+            self._repr = self.__class__.__name__ + \
+                '(by={!r}'.format(self.locator[0]) + \
+                ', value={!r}'.format(self.locator[1]) + \
+                (')' if self.index is None
+                 else ', index={})'.format(self.index))
+        return self._repr
+
+    @batched(lambda self: ['click', None])
     @timeit
     @wait_for_presence
     def click(self):
@@ -194,6 +405,7 @@ class UI(object):
     @timeit
     def is_present(self):
         """Define is ui element present at display."""
+        STATS['presence_checks'] += 1
         try:
             return self.webelement.is_displayed()
         except PRESENCE_ERRORS:
@@ -211,23 +423,111 @@ class UI(object):
         return self.container.webdriver
 
     @property
-    @cache
+    def app(self):
+        """Get application, ``None`` for custom container without it."""
+        return getattr(self.container, 'app', None)
+
+    @property
+    def generation(self):
+        """Navigation generation of application.
+
+        Custom container without generation is treated as never navigating.
+        """
+        return getattr(self.container, 'generation', 0)
+
+    @property
+    def _is_presence_fresh(self):
+        if not self.presence_ttl:
+            return False
+
+        verified = self.webelement._verified
+        return bool(verified) and verified[0] == self.generation and \
+            time.time() - verified[1] < self.presence_ttl
+
+    @property
     def webelement(self):
-        """Get webelement."""
-        if self.index:
-            webelement_getter = lambda self=self: \
-                self.container.find_elements(self.locator)[self.index]
+        """Get webelement.
 
-        else:
-            webelement_getter = lambda self=self: \
-                self.container.find_element(self.locator)
+        It is renewed after browser navigates, so elements found on previous
+        page aren't requested.
+        """
+        generation = self.generation
+        cached = self._webelement_cache
+        if cached is None or cached[0] != generation:
+            cached = self._webelement_cache = (
+                generation, WebElementProxy(self._find_webelement,
+                                            ui_info=repr(self)))
+        return cached[1]
+
+    def _seed(self, webelement):
+        """Bind web element found with enumeration of container.
+
+        It's used until browser navigates or it gets stale, then ui element
+        is looked up again.
+        """
+        self._webelement_cache = (
+            self.generation, WebElementProxy(self._find_webelement,
+                                             ui_info=repr(self),
+                                             webelement=webelement))
+
+    def _find_webelement(self):
+        chain = self._locator_chain()
+        if chain is None or len(chain) == 1 and self.index is None:
+            # webdriver finds ui element right in page cheaper, indexed one
+            # is found with script to avoid fetching all its siblings
+            return self._find_webelement_stepwise()
+
+        found = self.webdriver.execute_script(scripts.FIND_CHAIN, None, chain)
+        if not isinstance(found, six.integer_types):
+            return found
+        if found == len(chain) - 1:
+            raise exceptions.NoSuchElementException(
+                '{!r} is absent in DOM'.format(self))
+        # some container isn't present, wait for it step by step
+        return self._find_webelement_stepwise()
+
+    def _find_webelement_stepwise(self):
+        if self.index is not None:
+            return self.container.find_elements(self.locator)[self.index]
+        return self.container.find_element(self.locator)
+
+    def _locator_chain(self):
+        """Locators from the top container to ui element.
+
+        ``None`` if some container finds elements in own way.
+        """
+        chain = []
+        ui_obj = self
+        while isinstance(ui_obj, UI):
+            finder = getattr(type(ui_obj.container), 'find_element', None)
+            if finder not in _CHAIN_FINDERS:
+                return None
+            chain.append(list(ui_obj.locator) + [ui_obj.index])
+            ui_obj = ui_obj.container
 
-        return WebElementProxy(webelement_getter, ui_info=repr(self))
+        return chain[::-1]
 
     @property
     def _action_chains(self):
         return ActionChains(self.webdriver)
 
+    def _run_script(self, script, *args):
+        """Execute javascript with ui DOM element as first argument."""
+        try:
+            return self.webdriver.execute_script(
+                script, self.webelement._webelement(), *args)
+        except exceptions.StaleElementReferenceException:
+            self.webelement._flush()
+            return self.webdriver.execute_script(
+                script, self.webelement._webelement(), *args)
+
+    def _script_value(self, value):
+        """Value for setter script of ``value_script`` kind.
+
+        ``None`` if script can't set it, so it's set as usual.
+        """
+        return value
+
     def clone(self):
         """Clone ui element."""
         return self.__class__(self.locator[0],
@@ -237,29 +537,74 @@ class UI(object):
     @timeit
     def wait_for_presence(self, timeout=None):
         """Wait for ui element presence."""
-        timeout = timeout or self.timeout
-        try:
-            wait(lambda: self.is_present,
-                 timeout_seconds=timeout, sleep_seconds=0.1)
-        except TimeoutExpired:
-            raise Exception(
-                "{!r} is still absent after {} sec".format(self, timeout))
+        self._wait_for_visibility(True, timeout)
 
     @timeit
     def wait_for_absence(self, timeout=None):
         """Wait for ui element absence."""
+        self._wait_for_visibility(False, timeout)
+
+    def _wait_for_visibility(self, presence, timeout):
         timeout = timeout or self.timeout
+        limit = time.time() + timeout
+
+        self.webelement._verified = None
+
+        if bool(self.is_present) != presence:
+            self._wait_for_visibility_change(presence, limit, timeout)
+
+        if presence and self.presence_ttl:
+            self.webelement._verified = (self.generation, time.time())
+
+    def _wait_for_visibility_change(self, presence, limit, timeout):
+        webdriver = self.webdriver
+        if self.wait_strategy == 'observe' and webdriver not in _NO_OBSERVER:
+            try:
+                if self._observe_visibility(presence, limit):
+                    return
+            except PRESENCE_ERRORS as e:
+                LOGGER.debug('Fall back to polling of {!r}: {}'.format(
+                    self, e))
+            except exceptions.WebDriverException as e:
+                LOGGER.debug('Webdriver is polled since observer of {!r} '
+                             'failed: {}'.format(self, e))
+                _NO_OBSERVER.add(webdriver)
+
         try:
-            wait(lambda: not self.is_present,
-                 timeout_seconds=timeout, sleep_seconds=0.1)
+            wait(lambda: bool(self.is_present) == presence,
+                 timeout_seconds=max(limit - time.time(), 0),
+                 sleep_seconds=self.poll_interval)
         except TimeoutExpired:
-            raise Exception(
-                "{!r} is still present after {} sec".format(self, timeout))
+            raise Exception("{!r} is still {} after {} sec".format(
+                self, 'absent' if presence else 'present', timeout))
+
+    def _observe_visibility(self, presence, limit):
+        while True:
+            remaining = limit - time.time()
+            if remaining <= 0:
+                return False
+
+            STATS['observer_calls'] += 1
+            if self.webdriver.execute_async_script(
+                    scripts.WAIT_FOR_VISIBILITY,
+                    self.container._script_root,
+                    self.locator[0],
+                    self.locator[1],
+                    self.index,
+                    int(min(remaining, self.observe_slice) * 1000),
+                    presence):
+                return True
+
+            # container DOM element could be replaced, so check it via proxy
+            if bool(self.is_present) == presence:
+                return True
 
 
 class Block(UI, Container):
     """UI block is containerable ui element."""
 
+    __slots__ = ()
+
     @timeit
     @wait_for_presence
     def find_element(self, locator):
@@ -271,3 +616,33 @@ class Block(UI, Container):
     def find_elements(self, locator):
         """Find DOM elements inside container."""
         return super(Block, self).find_elements(locator)
+
+    @timeit
+    @wait_for_presence
+    def execute_script(self, script, *args):
+        """Execute javascript with block DOM element as first argument."""
+        try:
+            return super(Block, self).execute_script(script, *args)
+        except exceptions.StaleElementReferenceException:
+            self.webelement._flush()
+            return super(Block, self).execute_script(script, *args)
+
+    @timeit
+    @wait_for_presence
+    def execute_async_script(self, script, *args):
+        """Execute async javascript with block DOM element as first
+        argument.
+        """
+        try:
+            return super(Block, self).execute_async_script(script, *args)
+        except exceptions.StaleElementReferenceException:
+            self.webelement._flush()
+            return super(Block, self).execute_async_script(script, *args)
+
+    @property
+    def _script_root(self):
+        return self.webelement._webelement()
+
+
+# Containers which find elements like chain script does.
+_CHAIN_FINDERS = (Container.find_element, Block.find_element)
@@ -0,0 +1,151 @@
+"""
+Batch of ui actions executed with one script.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import functools
+import threading
+
+from . import scripts
+
+# Batch recording ui actions in current thread.
+_local = threading.local()
+
+
+def batched(action):
+    """Decorator to record ui action in active batch instead of executing.
+
+    Arguments:
+        - action: callable, gets ui element and action arguments, returns
+          ``[kind, argument]`` of action in batch script or ``None`` if
+          action can't be done with script.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwgs):
+            batch = getattr(_local, 'batch', None)
+            if batch is None or batch.app is not self.app:
+                return func(self, *args, **kwgs)
+
+            batch.record(self, action(self, *args, **kwgs),
+                         functools.partial(func, self, *args, **kwgs))
+
+        return wrapper
+
+    return decorator
+
+
+class Batch(object):
+    """Ui actions recorded to execute them with as few requests as possible.
+
+    Consecutive actions which script can do are executed with one script in
+    recorded order. Actions which script can't do (typing keystrokes,
+    matching regexps, ui element isn't visible yet, etc) are executed one
+    by one as usual, with waiting for ui element presence.
+
+    Script clicks are synthetic: element ``click()`` is called, so browser
+    doesn't check that element isn't overlapped by other one. Click may load
+    other document, so it ends script, next actions are executed with next
+    one, and application is notified that browser has navigated.
+    """
+
+    def __init__(self, page):
+        """Constructor.
+
+        Arguments:
+            - page: Page, its ui elements actions are recorded.
+        """
+        self.page = page
+        self.app = page.app
+        self.actions = []
+        self._outer = None
+
+    def __enter__(self):
+        """Start to record actions in current thread."""
+        self._outer = getattr(_local, 'batch', None)
+        _local.batch = self
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Execute recorded actions, if no error has happened.
+
+        Actions of nested batch are executed with outer one.
+        """
+        _local.batch = self._outer
+        if exc_type is not None:
+            return
+        if self._outer is not None:
+            self._outer.actions.extend(self.actions)
+            self.actions = []
+        else:
+            self.execute()
+
+    def record(self, ui_obj, action, call):
+        """Record ui action.
+
+        Arguments:
+            - ui_obj: UI, ui element.
+            - action: list, ``[kind, argument]`` of action in batch script or
+              ``None``.
+            - call: callable, executes action as usual.
+        """
+        chain = None
+        if action is not None and not ui_obj.needs_keystrokes:
+            chain = ui_obj._locator_chain()
+        self.actions.append(
+            (ui_obj, None if chain is None else [chain] + list(action), call))
+
+    def execute(self):
+        """Execute recorded actions in order.
+
+        Fails on the first action which can't be executed, next actions are
+        skipped.
+        """
+        actions, self.actions = self.actions, []
+        position = 0
+
+        while position < len(actions):
+            end = position
+            while end < len(actions) and actions[end][1] is not None:
+                end += 1
+                if actions[end - 1][1][1] == 'click':
+                    break
+
+            if end > position:
+                failed = self.page.execute_script(
+                    scripts.BATCH, [action for _, action, _ in
+                                    actions[position:end]])
+                if failed < 0:
+                    position = end
+                    self._clicked(actions[end - 1][1])
+                    continue
+                position += failed
+
+            ui_obj, action, call = actions[position]
+            try:
+                call()
+            except Exception as e:
+                raise Exception(
+                    'Batch action {} of {} failed on {!r}, next ones are '
+                    'skipped: {}'.format(position + 1, len(actions), ui_obj,
+                                         e))
+            position += 1
+            self._clicked(action)
+
+    def _clicked(self, action):
+        if action is not None and action[1] == 'click':
+            self.app.navigated()
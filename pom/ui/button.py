@@ -22,3 +22,5 @@ from .base import UI
 
 class Button(UI):
     """Button."""
+
+    __slots__ = ()
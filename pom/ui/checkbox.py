@@ -18,12 +18,17 @@ POM checkbox.
 # limitations under the License.
 
 from .base import UI, wait_for_presence
+from .batch import batched
 from ..utils import timeit
 
 
 class CheckBox(UI):
     """Checkbox."""
 
+    __slots__ = ()
+
+    value_reader = 'checked'
+
     @property
     @timeit
     @wait_for_presence
@@ -31,6 +36,7 @@ class CheckBox(UI):
         """Define is checkbox selected."""
         return self.webelement.is_selected()
 
+    @batched(lambda self: ['check', True])
     @timeit
     @wait_for_presence
     def select(self):
@@ -38,6 +44,7 @@ class CheckBox(UI):
         if not self.is_selected:
             self.webelement.click()
 
+    @batched(lambda self: ['check', False])
     @wait_for_presence
     def unselect(self):
         """Unselect checkbox if it is selected."""
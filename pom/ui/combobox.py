@@ -17,55 +17,135 @@ POM combobox.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from selenium.common import exceptions
-from selenium.webdriver.support.ui import Select
+import re
 
+import six
+
+from . import scripts
 from .base import UI, wait_for_presence
-from ..utils import timeit
+from .batch import batched
+from ..utils import cache, timeit
 
 
 class ComboBox(UI):
-    """Combobox."""
+    """Combobox.
+
+    Option texts are fetched with one script and cached until combobox DOM
+    element is renewed. Selection script checks that options are still the
+    same, otherwise it's repeated with actual options.
+    """
+
+    __slots__ = ()
+
+    value_script = 'select'
+    value_reader = 'select'
+    # How to match option text with value: "exact", "substring" or "regex".
+    match = 'substring'
 
     @property
     @timeit
     @wait_for_presence
     def value(self):
         """Combobox value."""
-        try:
-            return self._select.first_selected_option \
-                .get_attribute('innerHTML').strip()
-        except exceptions.NoSuchElementException as e:
-            if e.msg == 'No options are selected':
-                return ''
-            else:
-                raise
+        selected = self._run_script(scripts.SELECTED_OPTION_TEXTS)
+        return selected[0] if selected else ''
 
     @value.setter
     @timeit
-    @wait_for_presence
     def value(self, value):
-        """Set combobox value."""
-        if value in self.value:
-            return
-
-        for i, v in enumerate(self.values):
-            if value in v:
-                break
+        """Set combobox value, list of values for multiple combobox."""
+        if isinstance(value, (list, tuple)):
+            self.select(*value)
         else:
-            raise Exception(
-                '{!r} is absent among {} values'.format(value, self))
-
-        self._select.select_by_index(i)
+            self.select(value)
 
     @property
     @timeit
     @wait_for_presence
     def values(self):
         """Combobox values."""
-        return [o.get_attribute('innerHTML').strip()
-                for o in self._select.options]
+        return list(self._option_texts(self._element_token))
+
+    @property
+    @timeit
+    @wait_for_presence
+    def selected_values(self):
+        """Values of selected options."""
+        return self._run_script(scripts.SELECTED_OPTION_TEXTS)
+
+    @batched(lambda self, *values, **kwgs: _batch_action(
+        self, values, kwgs.get('match')))
+    @timeit
+    @wait_for_presence
+    def select(self, *values, **kwgs):
+        """Select options with one request.
+
+        If option with matched text is selected already, it stays selected.
+        Multiple combobox gets only matched options selected.
+
+        Arguments:
+            - values: strings or compiled regexps to match option texts.
+            - match: string, "exact", "substring" or "regex", combobox
+              ``match`` by default.
+        """
+        match = kwgs.get('match', self.match)
+        texts = self._option_texts(self._element_token)
+
+        for _ in range(2):
+            wanted = []
+            for value in values:
+                matcher = _matcher(value, match)
+                indexes = [i for i, text in enumerate(texts) if matcher(text)]
+                if not indexes:
+                    raise Exception(
+                        '{!r} is absent among {} values'.format(value, self))
+                wanted.append([indexes, texts[indexes[0]]])
+
+            actual = self._run_script(
+                scripts.SELECT_OPTIONS, len(texts), wanted)
+            if actual is None:
+                return
+
+            # options are changed since they were cached
+            self._option_texts.invalidate(self)
+            texts = actual
+
+        raise Exception("{!r} options are changing, can't select {!r}".format(
+            self, values))
+
+    def _script_value(self, value):
+        values = value if isinstance(value, (list, tuple)) else [value]
+        return _selection(self, values)
 
     @property
-    def _select(self):
-        return Select(self.webelement)
+    def _element_token(self):
+        return self.webelement._webelement()
+
+    @cache(maxsize=1)
+    def _option_texts(self, element_token):
+        return tuple(self._run_script(scripts.OPTION_TEXTS))
+
+
+def _selection(combobox, values, match=None):
+    """Argument of selection script, ``None`` if script can't match values."""
+    match = match or combobox.match
+    if match == 'regex' or not all(isinstance(value, six.string_types)
+                                   for value in values):
+        return None
+    return [list(values), match]
+
+
+def _batch_action(combobox, values, match):
+    selection = _selection(combobox, values, match)
+    return None if selection is None else ['select', selection]
+
+
+def _matcher(value, match):
+    if hasattr(value, 'search'):
+        return lambda text: value.search(text) is not None
+    if match == 'regex':
+        return re.compile(value).search
+    if match == 'exact':
+        return lambda text: text == value
+    value = six.text_type(value)
+    return lambda text: value in text
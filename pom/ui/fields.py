@@ -18,12 +18,18 @@ POM Fields.
 # limitations under the License.
 
 from .base import UI, wait_for_presence
+from .batch import batched
 from ..utils import timeit
 
 
 class TextField(UI):
     """Text field."""
 
+    __slots__ = ()
+
+    value_script = 'text'
+    value_reader = 'text_or_value'
+
     @property
     @timeit
     @wait_for_presence
@@ -32,6 +38,7 @@ class TextField(UI):
         return self.webelement.text or self.webelement.get_attribute('value')
 
     @value.setter
+    @batched(lambda self, text: ['text', text])
     @timeit
     @wait_for_presence
     def value(self, text):
@@ -43,6 +50,11 @@ class TextField(UI):
 class IntegerField(UI):
     """Integer field."""
 
+    __slots__ = ()
+
+    value_script = 'text'
+    value_reader = 'value'
+
     @property
     @timeit
     @wait_for_presence
@@ -51,6 +63,7 @@ class IntegerField(UI):
         return self.webelement.get_attribute('value')
 
     @value.setter
+    @batched(lambda self, text: ['text', text])
     @timeit
     @wait_for_presence
     def value(self, text):
@@ -62,6 +75,11 @@ class IntegerField(UI):
 class FileField(UI):
     """File field."""
 
+    __slots__ = ()
+
+    needs_keystrokes = True
+    value_reader = 'text'
+
     @property
     @timeit
     @wait_for_presence
@@ -70,6 +88,7 @@ class FileField(UI):
         return self.webelement.text
 
     @value.setter
+    @batched(lambda self, text: ['text', text])
     @timeit
     @wait_for_presence
     def value(self, text):
@@ -17,15 +17,22 @@ POM form block.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from .base import Block, wait_for_presence
+from .base import Block, navigates, wait_for_presence
 from ..utils import timeit
 
 
 class Form(Block):
     """Form."""
 
+    __slots__ = ()
+
     @timeit
+    @navigates
     @wait_for_presence
     def submit(self):
         """Submit form."""
         self.webelement.submit()
+
+    def fill(self, **values):
+        """Fill form fields, see ``set_values``."""
+        self.set_values(values)
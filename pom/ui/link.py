@@ -24,6 +24,8 @@ from ..utils import timeit
 class Link(UI):
     """Link."""
 
+    __slots__ = ()
+
     @property
     @timeit
     @wait_for_presence
@@ -0,0 +1,495 @@
+"""
+POM javascript snippets.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Scripts receive container DOM element as ``arguments[0]``. It is ``null``
+# for page container, so scripts should fall back to ``document``.
+
+# Cheap approximation of selenium ``is_displayed`` atom.
+_IS_VISIBLE = """
+function isVisible(el) {
+    if (!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) {
+        return false;
+    }
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+"""
+
+_XPATH = """
+function xpath(root, path) {
+    var result = document.evaluate(
+        path, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+}
+"""
+
+# Find element like selenium does with ``(by, value)`` locator and optional
+# index among all matched elements.
+_FIND = """
+function findAll(root, by, value) {
+    switch (by) {
+        case 'id':
+            return root.querySelectorAll('[id="' + value + '"]');
+        case 'name':
+            return root.querySelectorAll('[name="' + value + '"]');
+        case 'class name':
+            return root.getElementsByClassName(value);
+        case 'tag name':
+            return root.getElementsByTagName(value);
+        case 'css selector':
+            return root.querySelectorAll(value);
+        case 'xpath':
+            return xpath(root, value);
+        case 'link text':
+        case 'partial link text':
+            return Array.prototype.filter.call(
+                root.getElementsByTagName('a'), function(a) {
+                    var text = a.textContent.trim();
+                    return by === 'link text' ?
+                        text === value : text.indexOf(value) !== -1;
+                });
+    }
+    throw new Error('Unknown locator strategy: ' + by);
+}
+
+function find(root, by, value, index) {
+    var all = findAll(root, by, value);
+    index = index || 0;
+    return all[index < 0 ? all.length + index : index] || null;
+}
+"""
+
+# Visible rows as ``[index, cell values]``, value of hidden cell is ``null``.
+# If ``withTexts`` is ``true`` rows are ``[index, cell values, cell texts]``,
+# texts are text contents to match like xpath does.
+_SNAPSHOT = """
+function snapshot(rows, cellXpath, withTexts) {
+    var data = [];
+    for (var i = 0; i < rows.length; i++) {
+        if (!isVisible(rows[i])) {
+            continue;
+        }
+        var cells = xpath(rows[i], cellXpath);
+        var row = [i, cells.map(function(cell) {
+            return isVisible(cell) ? cell.innerHTML.trim() : null;
+        })];
+        if (withTexts) {
+            row.push(cells.map(function(cell) {
+                return isVisible(cell) ? cell.textContent : null;
+            }));
+        }
+        data.push(row);
+    }
+    return data;
+}
+"""
+
+TABLE_SNAPSHOT = _IS_VISIBLE + _XPATH + _SNAPSHOT + """
+return snapshot(xpath(arguments[0] || document, arguments[1]), arguments[2]);
+"""
+
+# Scroll the last rendered row into view, wait until rows are changed (or
+# timeout in ms is over) and resolve with snapshot of rows with cell texts.
+# If scroll flag is ``false`` resolve with snapshot at once.
+SCROLL_ROWS = _IS_VISIBLE + _XPATH + _SNAPSHOT + """
+var root = arguments[0] || document;
+var rowXpath = arguments[1], cellXpath = arguments[2];
+var scroll = arguments[3], timeout = arguments[4];
+var callback = arguments[arguments.length - 1];
+
+function done() {
+    callback(snapshot(xpath(root, rowXpath), cellXpath, true));
+}
+
+var rows = xpath(root, rowXpath);
+if (!scroll || !rows.length) {
+    return done();
+}
+
+var finished = false;
+var observer = new MutationObserver(finish);
+var timer = setTimeout(finish, timeout);
+
+function finish() {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    // let rendering of the whole batch of rows complete
+    setTimeout(done, 0);
+}
+
+observer.observe(root, {childList: true, characterData: true, subtree: true});
+rows[rows.length - 1].scrollIntoView();
+"""
+
+# Texts of cells with whitespaces collapsed.
+CELL_TEXTS = _XPATH + """
+return xpath(arguments[0] || document, arguments[1]).map(function(cell) {
+    return cell.textContent.replace(/\\s+/g, ' ').trim();
+});
+"""
+
+# Indexes of visible rows among ``count`` rows starting from ``start`` one,
+# and number of all rows: ``[indexes, total]``.
+ROWS_WINDOW = _IS_VISIBLE + _XPATH + """
+var root = arguments[0] || document;
+var rows = xpath(root, arguments[1]);
+var start = arguments[2], end = Math.min(start + arguments[3], rows.length);
+var visible = [];
+for (var i = start; i < end; i++) {
+    if (isVisible(rows[i])) {
+        visible.push(i);
+    }
+}
+return [visible, rows.length];
+"""
+
+# Visible elements found by ``by`` and ``value`` and their positions among
+# all found elements: ``[indexes, elements]``.
+FIND_VISIBLE = _IS_VISIBLE + _XPATH + _FIND + """
+var found = findAll(arguments[0] || document, arguments[1], arguments[2]);
+var indexes = [], elements = [];
+for (var i = 0; i < found.length; i++) {
+    if (isVisible(found[i])) {
+        indexes.push(i);
+        elements.push(found[i]);
+    }
+}
+return [indexes, elements];
+"""
+
+# Find element by chain of ``[by, value, index]`` locators, each one relative
+# to element found by previous one. Intermediate elements should be visible.
+# Returns element or position of locator which failed.
+FIND_CHAIN = _IS_VISIBLE + _XPATH + _FIND + """
+var el = arguments[0] || document, chain = arguments[1];
+for (var i = 0; i < chain.length; i++) {
+    el = find(el, chain[i][0], chain[i][1], chain[i][2]);
+    if (el === null || (i < chain.length - 1 && !isVisible(el))) {
+        return i;
+    }
+}
+return el;
+"""
+
+# Resolve with ``true`` as soon as element (or its absence, if the last but
+# one argument is ``false``) is visible, without polling from client side.
+WAIT_FOR_VISIBILITY = _IS_VISIBLE + _XPATH + _FIND + """
+var root = arguments[0] || document;
+var by = arguments[1], value = arguments[2], index = arguments[3];
+var timeout = arguments[4], presence = arguments[5];
+var callback = arguments[arguments.length - 1];
+
+function check() {
+    var el = find(root, by, value, index);
+    return (el !== null && isVisible(el)) === presence;
+}
+
+if (check()) {
+    return callback(true);
+}
+
+var done = false;
+var observer = new MutationObserver(function() {
+    if (!done && check()) {
+        finish(true);
+    }
+});
+var timer = setTimeout(function() { finish(check()); }, timeout);
+
+function finish(result) {
+    done = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    callback(result);
+}
+
+observer.observe(document.documentElement, {
+    attributes: true, childList: true, characterData: true, subtree: true});
+"""
+
+# Set value of text input like user does, firing ``input`` and ``change``
+# events. Returns ``false`` if input is disabled or read only.
+_SET_TEXT = """
+function fire(el, type) {
+    el.dispatchEvent(new Event(type, {bubbles: true}));
+}
+
+function setText(el, text) {
+    if (el.disabled || el.readOnly) {
+        return false;
+    }
+    // native setter keeps frameworks tracking input value in sync
+    var descriptor = Object.getOwnPropertyDescriptor(
+        Object.getPrototypeOf(el), 'value');
+    if (descriptor && descriptor.set) {
+        descriptor.set.call(el, text);
+    } else {
+        el.value = text;
+    }
+    fire(el, 'input');
+    fire(el, 'change');
+    return true;
+}
+"""
+
+# Select options of ``select`` element which texts match values, like
+# ``ComboBox.select`` does. Match is ``exact`` or ``substring``. Returns
+# ``false`` if element is disabled or some value doesn't match any option.
+_SELECT = """
+function select(el, values, match) {
+    if (el.disabled) {
+        return false;
+    }
+    var options = el.options, chosen = [];
+    for (var i = 0; i < values.length; i++) {
+        var matched = [];
+        for (var j = 0; j < options.length; j++) {
+            var text = options[j].innerHTML.trim();
+            if (match === 'exact' ? text === values[i] :
+                    text.indexOf(values[i]) !== -1) {
+                matched.push(j);
+            }
+        }
+        if (!matched.length) {
+            return false;
+        }
+        var selected = matched.filter(function(j) {
+            return options[j].selected;
+        });
+        chosen.push(selected.length ? selected[0] : matched[0]);
+    }
+    if (!el.multiple) {
+        chosen = chosen.slice(0, 1);
+    }
+
+    var changed = false;
+    for (var i = 0; i < options.length; i++) {
+        var wanted = chosen.indexOf(i) !== -1;
+        if (options[i].selected !== wanted) {
+            options[i].selected = wanted;
+            changed = true;
+        }
+    }
+    if (changed) {
+        fire(el, 'input');
+        fire(el, 'change');
+    }
+    return true;
+}
+"""
+
+# Set values of form fields like user does and return indexes of fields
+# which can't be set. Fields are ``[by, value, index, kind, field value]``,
+# kind is ``text`` or ``select`` (field value is ``[option texts, match]``).
+SET_VALUES = _IS_VISIBLE + _XPATH + _FIND + _SET_TEXT + _SELECT + """
+var root = arguments[0] || document;
+var fields = arguments[1];
+var failed = [];
+
+for (var i = 0; i < fields.length; i++) {
+    var field = fields[i];
+    var el = find(root, field[0], field[1], field[2]);
+    var done = el !== null && isVisible(el) && (
+        field[3] === 'select' ? select(el, field[4][0], field[4][1]) :
+        setText(el, String(field[4])));
+    if (!done) {
+        failed.push(i);
+    }
+}
+return failed;
+"""
+
+# Read values of ui elements to object by their names. Ui elements are
+# ``[name, by, value, index, kind, children]``, kind defines how to read
+# value, children are ui elements of block. If the last argument is ``true``
+# ui elements states are read too.
+READ_VALUES = _IS_VISIBLE + _XPATH + _FIND + """
+function readValue(el, kind) {
+    switch (kind) {
+        case 'text':
+            return el.innerText.trim();
+        case 'value':
+            return el.value;
+        case 'text_or_value':
+            return el.innerText.trim() || el.value;
+        case 'select':
+            var option = el.options[el.selectedIndex];
+            return option ? option.innerHTML.trim() : '';
+        case 'checked':
+            return el.checked;
+    }
+    throw new Error('Unknown value kind: ' + kind);
+}
+
+function read(root, uis, states) {
+    var result = {};
+    for (var i = 0; i < uis.length; i++) {
+        var ui = uis[i];
+        var el = root && find(root, ui[1], ui[2], ui[3]);
+        var present = !!el && isVisible(el);
+        if (ui[5]) {
+            result[ui[0]] = read(present ? el : null, ui[5], states);
+            continue;
+        }
+        var value = ui[4] && present ? readValue(el, ui[4]) : null;
+        if (states) {
+            result[ui[0]] = {is_present: present,
+                             is_enabled: present && !el.disabled};
+            if (ui[4]) {
+                result[ui[0]].value = value;
+            }
+        } else if (ui[4]) {
+            result[ui[0]] = value;
+        }
+    }
+    return result;
+}
+
+return read(arguments[0] || document, arguments[1], arguments[2]);
+"""
+
+# Scripts of combobox get ``select`` DOM element as ``arguments[0]``.
+_OPTION_TEXTS = """
+function texts(options) {
+    return Array.prototype.map.call(options, function(option) {
+        return option.innerHTML.trim();
+    });
+}
+"""
+
+OPTION_TEXTS = _OPTION_TEXTS + """
+return texts(arguments[0].options);
+"""
+
+SELECTED_OPTION_TEXTS = _OPTION_TEXTS + """
+return texts(Array.prototype.filter.call(arguments[0].options, function(o) {
+    return o.selected;
+}));
+"""
+
+# Select options and fire ``input`` and ``change`` events if selection is
+# changed. Every wanted value is ``[indexes of matched options, text of the
+# first one]``, already selected option among matched ones stays selected.
+# If options differ from expected ones (by count and texts) nothing is
+# selected and actual option texts are returned.
+SELECT_OPTIONS = _OPTION_TEXTS + """
+var el = arguments[0], count = arguments[1], wanted = arguments[2];
+var options = el.options;
+
+for (var i = 0; i < wanted.length; i++) {
+    var option = options[wanted[i][0][0]];
+    if (options.length !== count || !option ||
+            option.innerHTML.trim() !== wanted[i][1]) {
+        return texts(options);
+    }
+}
+
+var chosen = wanted.map(function(value) {
+    for (var i = 0; i < value[0].length; i++) {
+        if (options[value[0][i]].selected) {
+            return value[0][i];
+        }
+    }
+    return value[0][0];
+});
+
+var changed = false;
+if (el.multiple) {
+    for (var i = 0; i < options.length; i++) {
+        var selected = chosen.indexOf(i) !== -1;
+        if (options[i].selected !== selected) {
+            options[i].selected = selected;
+            changed = true;
+        }
+    }
+} else if (el.selectedIndex !== chosen[0]) {
+    el.selectedIndex = chosen[0];
+    changed = true;
+}
+
+if (changed) {
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+}
+return null;
+"""
+
+# Perform ui actions ``[chain, kind, argument]`` in order and return position
+# of the first action which can't be performed, or ``-1``. Chain is
+# ``[by, value, index]`` locators from page to ui element, all found elements
+# should be visible. Kinds are ``click``, ``check`` (argument is wanted state
+# of checkbox), ``text`` (argument is text) and ``select`` (argument is
+# ``[option texts, match]``, match is ``exact`` or ``substring``). Click is
+# synthetic ``click()`` of element and it's the last action of script, since
+# it may load other document.
+BATCH = _IS_VISIBLE + _XPATH + _FIND + _SET_TEXT + _SELECT + """
+var root = arguments[0] || document, actions = arguments[1];
+
+function findChain(chain) {
+    var el = root;
+    for (var i = 0; i < chain.length; i++) {
+        el = find(el, chain[i][0], chain[i][1], chain[i][2]);
+        if (el === null || !isVisible(el)) {
+            return null;
+        }
+    }
+    return el;
+}
+
+for (var i = 0; i < actions.length; i++) {
+    var el = findChain(actions[i][0]), arg = actions[i][2];
+    if (el === null) {
+        return i;
+    }
+    switch (actions[i][1]) {
+        case 'click':
+            el.click();
+            break;
+        case 'check':
+            if (el.disabled) {
+                return i;
+            }
+            if (el.checked !== arg) {
+                el.click();
+            }
+            break;
+        case 'text':
+            if (!setText(el, String(arg))) {
+                return i;
+            }
+            break;
+        case 'select':
+            if (!select(el, arg[0], arg[1])) {
+                return i;
+            }
+            break;
+        default:
+            return i;
+    }
+}
+return -1;
+"""
@@ -0,0 +1,146 @@
+"""
+XPath selectors of ui elements.
+
+@author: chipiga86@gmail.com
+"""
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or
+# implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import six
+
+# Compiled selectors are few (one per table class and set of columns), so
+# caches aren't bounded. Dict operations are atomic, no locks are needed.
+_MERGED = {}
+_TEMPLATES = {}
+_PLACEHOLDER = '\x00'
+
+
+def literal(value):
+    """XPath string literal of value, with quotes escaped."""
+    if not isinstance(value, six.string_types):
+        value = six.text_type(value)
+    if '"' not in value:
+        return '"' + value + '"'
+    if "'" not in value:
+        return "'" + value + "'"
+    parts = value.split('"')
+    return 'concat({})'.format(', \'"\', '.join(
+        '"{}"'.format(part) for part in parts))
+
+
+def merge(xpath, condition):
+    """Add condition to the last step predicate of xpath."""
+    key = xpath, condition
+    merged = _MERGED.get(key)
+    if merged is None:
+        if xpath.endswith(']'):
+            merged = xpath[:-1] + ' and {}]'.format(condition)
+        else:
+            merged = xpath + '[{}]'.format(condition)
+        _MERGED[key] = merged
+    return merged
+
+
+def position(column):
+    """XPath expression of cell position.
+
+    Header text gives position 1 if table has no such header, so cell
+    selectors check header presence too (see ``cell_selector``).
+
+    Arguments:
+        - column: int, cell position starting from 1, or string, text of
+          header cell of table column.
+    """
+    if isinstance(column, six.integer_types):
+        return str(column)
+    return ('count(ancestor::table[1]//thead//th[normalize-space(.)={}]'
+            '/preceding-sibling::th)+1'.format(literal(column)))
+
+
+class Template(object):
+    """Compiled xpath with placeholders of string values."""
+
+    __slots__ = ('_chunks', '_quoted')
+
+    def __init__(self, xpath):
+        """Constructor.
+
+        Arguments:
+            - xpath: string, xpath with placeholders where values go.
+        """
+        self._chunks = xpath.split(_PLACEHOLDER)
+        self._quoted = '"{}"'.join(
+            chunk.replace('{', '{{').replace('}', '}}')
+            for chunk in self._chunks).format
+
+    def render(self, *values):
+        """XPath with escaped values."""
+        chunks = self._chunks
+        # usual values have no double quotes, they are quoted as is
+        if len(chunks) == 2:
+            value = values[0]
+            if isinstance(value, six.string_types) and '"' not in value:
+                return chunks[0] + '"' + value + '"' + chunks[1]
+            return chunks[0] + literal(value) + chunks[1]
+
+        for value in values:
+            if not isinstance(value, six.string_types) or '"' in value:
+                break
+        else:
+            return self._quoted(*values)
+
+        parts = [chunks[0]]
+        for value, chunk in zip(values, chunks[1:]):
+            parts.append(literal(value))
+            parts.append(chunk)
+        return ''.join(parts)
+
+
+def cell_selector(cell_xpath, column):
+    """XPath of row cell in column."""
+    condition = 'position()=' + position(column)
+    if not isinstance(column, six.integer_types):
+        condition += ' and ancestor::table[1]//thead//th[' \
+            'normalize-space(.)={}]'.format(literal(column))
+    return merge(cell_xpath, condition)
+
+
+def row_template(row_xpath, cell_xpath, columns):
+    """Template of row xpath by values contained in its cells.
+
+    Arguments:
+        - row_xpath: string, xpath of rows.
+        - cell_xpath: string, xpath of row cells.
+        - columns: tuple, cell positions or header texts of columns, values
+          are rendered in the same order.
+    """
+    key = row_xpath, cell_xpath, columns
+    template = _TEMPLATES.get(key)
+    if template is None:
+        condition = ' and '.join(
+            merge(cell_selector(cell_xpath, column),
+                  'contains(., {})'.format(_PLACEHOLDER))
+            for column in columns)
+        template = _TEMPLATES[key] = Template(merge(row_xpath, condition))
+    return template
+
+
+def content_template(xpath):
+    """Template of xpath by value contained in element."""
+    key = xpath, None
+    template = _TEMPLATES.get(key)
+    if template is None:
+        template = _TEMPLATES[key] = Template(
+            merge(xpath, 'contains(., {})'.format(_PLACEHOLDER)))
+    return template
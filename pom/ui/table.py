@@ -17,35 +17,101 @@ POM table block.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+import re
+
 import six
 
 from selenium.webdriver.common.by import By
 
-from .base import Block, register_ui
-from ..utils import timeit
+from . import scripts, selectors
+from .base import Block, register_ui, STATS
+from ..utils import cache, timeit
+
+
+class RowData(Mapping):
+    """Immutable row of table snapshot.
+
+    Maps column names to cell values. If table has no columns, cell positions
+    (starting from 1) are used as keys. Value of invisible cell is ``None``.
+    """
+
+    __slots__ = ('_body', '_index', '_cells', '_columns')
+
+    def __init__(self, body, index, cells, columns=None):
+        """Constructor.
+
+        Arguments:
+            - body: Body, table body of row.
+            - index: int, row index.
+            - cells: list, cell values.
+            - columns: dict, column cell positions, resolved by body if
+              omitted.
+        """
+        self._body = body
+        self._index = index
+        self._cells = tuple(cells)
+        if columns is None:
+            columns = body._column_positions()
+        self._columns = columns or dict(
+            (position, position) for position in range(1, len(cells) + 1))
+
+    def __getitem__(self, name):
+        """Get cell value by column name."""
+        position = self._columns[name]
+        try:
+            return self._cells[position - 1]
+        except IndexError:
+            raise KeyError(name)
+
+    def __iter__(self):
+        """Iterate over column names."""
+        return iter(self._columns)
+
+    def __len__(self):
+        """Number of columns."""
+        return len(self._columns)
+
+    def __repr__(self):
+        """Object representation."""
+        return '{}(index={}, {!r})'.format(
+            self.__class__.__name__, self._index, dict(self))
 
+    @property
+    def cells(self):
+        """Cell values in order of positions."""
+        return self._cells
 
-def _merge_xpath(xpath, attr):
-    if xpath.endswith(']'):
-        return xpath[:-1] + ' and {}]'.format(attr)
-    else:
-        return xpath + '[{}]'.format(attr)
+    @property
+    def row(self):
+        """Live row to interact with."""
+        row = self._body.row_cls(By.XPATH, self._body.row_xpath,
+                                 index=self._index)
+        row.container = self._body
+        return row
 
 
 class _CellsMixin(object):
 
+    __slots__ = ()
+
     @property
     @timeit
     def cells(self):
+        """Visible cells, bound to found web elements."""
         locator = By.XPATH, self.cell_xpath
         _cells = []
 
-        for index, element in enumerate(self.find_elements(locator)):
-            if element.is_displayed():
-
-                cell = self.cell_cls(locator[0], locator[1], index=index)
-                cell.container = self
-                _cells.append(cell)
+        for index, element in self.find_visible_elements(locator,
+                                                         indexes=True):
+            cell = self.cell_cls(locator[0], locator[1], index=index)
+            cell.container = self
+            cell._seed(element)
+            _cells.append(cell)
 
         return _cells
 
@@ -55,32 +121,59 @@ class _CellsMixin(object):
         return cell
 
     def _cell_selector(self, name):
-        position = self.container.columns[name]
-        return _merge_xpath(self.cell_xpath, 'position()={}'.format(position))
+        return selectors.cell_selector(self.cell_xpath,
+                                       self.container.columns[name])
 
 
 class _RowsMixin(object):
 
+    __slots__ = ()
+
     @property
     @timeit
     def rows(self):
-        """Visible rows."""
+        """Visible rows, bound to found web elements."""
         locator = By.XPATH, self.row_xpath
         _rows = []
 
-        for index, element in enumerate(self.find_elements(locator)):
-            if element.is_displayed():
+        for index, element in self.find_visible_elements(locator,
+                                                         indexes=True):
+            row = self.row_cls(locator[0], locator[1], index=index)
+            row.container = self
+            row._seed(element)
+            _rows.append(row)
 
-                row = self.row_cls(locator[0], locator[1], index=index)
+        return _rows
+
+    def iter_rows(self, chunk_size=100):
+        """Iterate over visible rows lazily.
+
+        Visibility of rows is checked with one script per chunk of rows,
+        next chunk is requested only when iteration reaches it.
+
+        Arguments:
+            - chunk_size: int, number of rows checked at once.
+        """
+        start = 0
+        while True:
+            indexes, total = self.execute_script(
+                scripts.ROWS_WINDOW, self.row_xpath, start, chunk_size)
+
+            for index in indexes:
+                row = self.row_cls(By.XPATH, self.row_xpath, index=index)
                 row.container = self
-                _rows.append(row)
+                yield row
 
-        return _rows
+            start += chunk_size
+            if start >= total:
+                return
 
 
 class Row(Block, _CellsMixin):
     """Row of table."""
 
+    __slots__ = ()
+
     cell_cls = Block
     cell_xpath = './/td'
 
@@ -88,6 +181,8 @@ class Row(Block, _CellsMixin):
 class Header(Block, _CellsMixin):
     """Header of table."""
 
+    __slots__ = ()
+
     cell_cls = Block
     cell_xpath = './/th'
 
@@ -95,6 +190,8 @@ class Header(Block, _CellsMixin):
 class Body(Block, _RowsMixin):
     """Table body."""
 
+    __slots__ = ()
+
     @property
     def row_cls(self):
         """Row table class."""
@@ -108,7 +205,11 @@ class Body(Block, _RowsMixin):
     @property
     def columns(self):
         """Table columns."""
-        return self.container.columns
+        return self.container._table_columns()
+
+    def _column_positions(self):
+        """Table columns with header texts resolved to cell positions."""
+        return self.container._column_positions()
 
     def row(self, **kwgs):
         """Get row of table."""
@@ -116,35 +217,92 @@ class Body(Block, _RowsMixin):
         row.container = self
         return row
 
-    def _row_selector(self, **kwgs):
-        pos_tmpl = 'position()={} and contains(., "{}")'
-        cell_selectors = []
-
-        for name, value in six.iteritems(kwgs):
-            position = self.columns[name]
-            cell_xpath = _merge_xpath(self.row_cls.cell_xpath,
-                                      pos_tmpl.format(position, value))
-            cell_selectors.append(cell_xpath)
-
-        cell_selector = " and ".join(cell_selectors)
+    @timeit
+    def rows_data(self):
+        """Snapshot of visible rows fetched with single script execution."""
+        data = self.execute_script(scripts.TABLE_SNAPSHOT,
+                                   self.row_xpath,
+                                   self.row_cls.cell_xpath)
+        columns = self._column_positions()
+        return tuple(RowData(self, index, cells, columns)
+                     for index, cells in data)
 
-        return _merge_xpath(self.row_xpath, cell_selector)
+    def _row_selector(self, **kwgs):
+        names = tuple(kwgs)
+        columns = self.columns
+        template = selectors.row_template(
+            self.row_xpath, self.row_cls.cell_xpath,
+            tuple([columns[name] for name in names]))
+        # unchanged dict gives values in the same order as names
+        return template.render(*kwgs.values())
 
 
 class Footer(Block):
     """Table footer."""
 
+    __slots__ = ()
+
 
 @register_ui(
     header=Header(By.TAG_NAME, 'thead'),
     body=Body(By.TAG_NAME, 'tbody'),
     footer=Footer(By.TAG_NAME, 'tfoot'))
 class Table(Block):
-    """Table."""
+    """Table.
+
+    ``columns`` maps column names to cell positions (or header texts). If
+    ``discover_columns`` is set, columns are taken from header cell texts
+    with one request: text "User name" gives column ``user_name``. They are
+    cached till browser navigates.
+    """
+
+    __slots__ = ()
 
     row_cls = Row
     row_xpath = './/tr'
     columns = None
+    discover_columns = False
+
+    def _table_columns(self):
+        """Table columns, discovered from header if ``discover_columns``."""
+        if self.discover_columns:
+            return self._header_columns()
+        return self.columns
+
+    def _column_positions(self):
+        """Table columns with header texts resolved to cell positions.
+
+        Header texts are fetched once till browser navigates. Columns which
+        header isn't found are skipped, so row data has no such keys.
+        """
+        columns = self._table_columns()
+        if not columns or all(isinstance(column, six.integer_types)
+                              for column in columns.values()):
+            return columns
+
+        texts = self._header_texts()
+        positions = {}
+        for name, column in six.iteritems(columns):
+            if not isinstance(column, six.integer_types):
+                if column not in texts:
+                    continue
+                column = texts.index(column) + 1
+            positions[name] = column
+        return positions
+
+    @cache(scope='generation')
+    def _header_texts(self):
+        return self.header.execute_script(scripts.CELL_TEXTS,
+                                          self.header.cell_xpath)
+
+    @cache(scope='generation')
+    def _header_columns(self):
+        columns = {}
+        for position, text in enumerate(self._header_texts(), 1):
+            name = re.sub(r'\W+', '_', text.lower()).strip('_')
+            if name:
+                columns.setdefault(name, position)
+        return columns
 
     @property
     def rows(self):
@@ -155,17 +313,98 @@ class Table(Block):
         """Get row of table."""
         return self.body.row(**kwgs)
 
+    def iter_rows(self, chunk_size=100):
+        """Iterate over visible table rows lazily, see ``Body.iter_rows``."""
+        return self.body.iter_rows(chunk_size)
+
+    def snapshot(self):
+        """Snapshot of visible table rows."""
+        return self.body.rows_data()
+
+
+class VirtualTable(Table):
+    """Table with virtualized rows, which are rendered while scrolling.
+
+    Rows are read with snapshots, before each next snapshot the last rendered
+    row is scrolled into view to render or load next rows. Rows are
+    deduplicated by ``key_column`` value or by all cells if it isn't set.
+    Reading stops when ``idle_steps`` scrolls in a row bring no new rows.
+
+    Live rows of snapshots are valid till next scroll.
+    """
+
+    __slots__ = ('scroll_steps',)
+
+    key_column = None
+    # Milliseconds to wait for rows change after scroll.
+    scroll_timeout = 500
+    idle_steps = 2
+    max_steps = 1000
+
+    def __init__(self, *locator, **index):
+        """Constructor."""
+        super(VirtualTable, self).__init__(*locator, **index)
+        self.scroll_steps = 0
+
+    def iter_rows_data(self):
+        """Iterate over unique rows scrolling table incrementally."""
+        for row_data, _ in self._iter_rows_texts():
+            yield row_data
+
+    def _iter_rows_texts(self):
+        """Iterate over unique rows with their cell texts."""
+        keys = set()
+        idle = 0
+
+        for step in range(self.max_steps):
+            if step:
+                self.scroll_steps += 1
+                STATS['scroll_steps'] += 1
+
+            data = self.body.execute_async_script(
+                scripts.SCROLL_ROWS, self.row_xpath, self.row_cls.cell_xpath,
+                bool(step), self.scroll_timeout)
+            idle += 1
+            columns = self.body._column_positions()
+
+            for index, cells, texts in data:
+                row_data = RowData(self.body, index, cells, columns)
+                key = row_data[self.key_column] if self.key_column \
+                    else row_data.cells
+                if key not in keys:
+                    keys.add(key)
+                    idle = 0
+                    yield row_data, RowData(self.body, index, texts,
+                                            columns)
+
+            if idle >= self.idle_steps:
+                return
+
+    def row(self, **kwgs):
+        """Scroll table until row with cells containing values is rendered.
+
+        Cells are matched by text contents like row xpath does. Raises
+        exception if table is scrolled to the end without match.
+        """
+        for _, texts in self._iter_rows_texts():
+            if all(six.text_type(value) in (texts[name] or '')
+                   for name, value in six.iteritems(kwgs)):
+                return super(VirtualTable, self).row(**kwgs)
+
+        raise Exception('{!r} has no row with {}'.format(self, kwgs))
+
 
 class List(Block, _RowsMixin):
     """List."""
 
+    __slots__ = ()
+
     row_cls = Row
     row_xpath = ".//li"
 
     def row(self, content):
         """Get row of table."""
-        xpath = _merge_xpath(self.row_xpath,
-                             'contains(., "{}")'.format(content))
+        xpath = selectors.content_template(self.row_xpath).render(content)
         row = self.row_cls(By.XPATH, xpath)
         row.container = self
         return row
@@ -17,12 +17,17 @@ POM utils.
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
 import functools
 import logging
+import threading
 import time
 
+from . import profiling
+
 __all__ = [
     'cache',
+    'invalidate',
     'sleep',
     'timeit'
 ]
@@ -30,38 +35,142 @@ __all__ = [
 TIMEIT_LOG = logging.getLogger('timeit')
 LOGGER = logging.getLogger(__name__)
 
+CacheInfo = collections.namedtuple('CacheInfo', ['hits', 'misses', 'maxsize'])
+# Guards cached results only, cached methods are called outside of it.
+_CACHE_LOCK = threading.RLock()
+# Separates positional and keyword arguments in cache key.
+_KWD_MARK = object()
+
+
+def cache(func=None, maxsize=None, scope=None):
+    """Decorator to cache instance method execution result.
+
+    Results are cached per instance and call arguments, including falsy
+    ones. Can be used with or without arguments::
+
+        @cache
+        def method(self): ...
+
+        @cache(maxsize=100, scope='generation')
+        def method(self, arg): ...
+
+    Arguments:
+        - maxsize: int, max number of cached results per instance. Least
+          recently used results are dropped first.
+        - scope: string, instance attribute name. Cached results are valid
+          while its value stays the same.
 
-def cache(func):
-    """Decorator to cache instance method execution result."""
-    attrname = '_cached_{}_{}'.format(func.__name__, id(func))
+    Decorated method has ``cache_info()`` to get hits and misses statistics
+    and ``invalidate(obj)`` to drop cached results of instance.
+    """
+    if func is None:
+        return functools.partial(cache, maxsize=maxsize, scope=scope)
+
+    key_name = '{}_{}'.format(func.__name__, id(func))
+    stats = {'hits': 0, 'misses': 0}
 
     @functools.wraps(func)
     def wrapper(self, *args, **kwgs):
-        result = getattr(self, attrname, None)
-        if not result:
-            result = func(self, *args, **kwgs)
-            setattr(self, attrname, result)
+        token = getattr(self, scope) if scope else None
+        key = args + (_KWD_MARK,) + tuple(sorted(kwgs.items())) \
+            if kwgs else args
+
+        with _CACHE_LOCK:
+            storage = _cache_storage(self)
+            if maxsize:
+                results = storage.setdefault(
+                    key_name, collections.OrderedDict())
+            else:
+                # unbounded results are kept right in instance storage
+                results = storage
+                key = (key_name, key) if key else key_name
+            try:
+                entry = results.get(key)
+            except TypeError:  # unhashable arguments
+                entry = key = None
+
+            if entry is not None and entry[0] == token:
+                stats['hits'] += 1
+                if maxsize:
+                    results[key] = results.pop(key)
+                return entry[1]
+
+            stats['misses'] += 1
+
+        result = func(self, *args, **kwgs)
+        if key is None:
+            return result
+
+        with _CACHE_LOCK:
+            # concurrent call could cache result already, first one wins
+            entry = results.get(key)
+            if entry is not None and entry[0] == token:
+                return entry[1]
+
+            results[key] = (token, result)
+            if maxsize and len(results) > maxsize:
+                results.popitem(last=False)
+
         return result
 
+    def cache_info():
+        """Statistics of cache."""
+        return CacheInfo(stats['hits'], stats['misses'], maxsize)
+
+    def invalidate(obj):
+        """Drop cached results of instance."""
+        with _CACHE_LOCK:
+            storage = _cache_storage(obj)
+            if maxsize:
+                storage.pop(key_name, None)
+            else:
+                for key in [key for key in storage if key == key_name or
+                            isinstance(key, tuple) and key[0] == key_name]:
+                    del storage[key]
+
+    wrapper.cache_info = cache_info
+    wrapper.invalidate = invalidate
     return wrapper
 
 
+def invalidate(obj):
+    """Drop all cached results of instance."""
+    with _CACHE_LOCK:
+        _cache_storage(obj).clear()
+
+
+def _cache_storage(obj):
+    storage = getattr(obj, '_cache', None)
+    if storage is None:
+        storage = obj._cache = {}
+    return storage
+
+
 def timeit(type_name):
-    """Decorator to log function execution time."""
+    """Decorator to profile function execution.
+
+    Execution time is logged to ``timeit`` logger with DEBUG level and spans
+    are sent to profiling sinks. Without both it costs a couple of checks.
+    """
     def decorator(func):
         @functools.wraps(func)
         def wrapper(*args, **kwgs):
-            start = time.time()
+            if not (profiling.SINKS or TIMEIT_LOG.isEnabledFor(logging.DEBUG)):
+                return func(*args, **kwgs)
+
+            if args:
+                op = '{}.{}'.format(args[0].__class__.__name__, func.__name__)
+            else:
+                op = func.__name__
+            span = profiling.start_span(op, args[0] if args else None)
             try:
                 return func(*args, **kwgs)
             finally:
+                profiling.finish_span(span)
                 TIMEIT_LOG.debug(
-                    "{} {!r} with args {!r} and kwargs {!r} took {:.4f}"
-                    " second(s)".format(type_name or 'Function',
-                                        func.__name__,
-                                        args,
-                                        kwgs,
-                                        time.time() - start))
+                    "%s %r of %s took %.4f second(s) and %d request(s)",
+                    type_name or 'Function', op, span.target, span.duration,
+                    span.commands)
         return wrapper
 
     if callable(type_name):
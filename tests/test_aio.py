@@ -0,0 +1,205 @@
+import asyncio
+import itertools
+import json
+
+import pytest
+from hamcrest import *
+from selenium.common import exceptions
+from selenium.webdriver.common.by import By
+
+import pom
+from pom import aio
+
+
+class StubWebDriver(object):
+    """Minimal webdriver server speaking W3C protocol."""
+
+    def __init__(self):
+        self.sessions = {}
+        self.elements = {'[id="button"]': 'el-button'}
+        self.clicks = []
+        self.scripts = []
+        self.writers = []
+        self._ids = itertools.count()
+
+    async def start(self):
+        self.server = await asyncio.start_server(
+            self.handle, '127.0.0.1', 0)
+        self.url = 'http://127.0.0.1:{}/wd/hub'.format(
+            self.server.sockets[0].getsockname()[1])
+
+    async def handle(self, reader, writer):
+        self.writers.append(writer)
+        while True:
+            request_line = await reader.readline()
+            if not request_line:
+                break
+            method, path, _ = request_line.decode().split()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line == b'\r\n':
+                    break
+                name, value = line.decode().split(':', 1)
+                if name.lower() == 'content-length':
+                    length = int(value)
+            body = await reader.readexactly(length) if length else b''
+            status, value = self.route(
+                method, path[len('/wd/hub'):].split('/')[1:],
+                json.loads(body.decode()) if body else None)
+            data = json.dumps({'value': value}).encode()
+            writer.write(b'HTTP/1.1 ' + str(status).encode() + b' OK\r\n'
+                         b'Content-Length: ' + str(len(data)).encode() +
+                         b'\r\n\r\n' + data)
+            await writer.drain()
+        writer.close()
+
+    def route(self, method, path, payload):
+        if path == ['session']:
+            session_id = 'session-{}'.format(next(self._ids))
+            self.sessions[session_id] = None
+            return 200, {'sessionId': session_id, 'capabilities': {}}
+
+        session_id, command = path[1], path[2:]
+        if not command:
+            del self.sessions[session_id]
+            return 200, None
+        if command == ['url']:
+            if method == 'POST':
+                self.sessions[session_id] = payload['url']
+            return 200, self.sessions[session_id]
+        if command == ['element']:
+            try:
+                element_id = self.elements[payload['value']]
+            except KeyError:
+                return 404, {'error': 'no such element', 'message': ''}
+            return 200, {aio.ELEMENT_KEY: element_id}
+        if command[-1] == 'displayed':
+            return 200, True
+        if command == ['execute', 'sync']:
+            self.scripts.append(payload['args'])
+            return 200, [[0], [{aio.ELEMENT_KEY: 'el-row'}]]
+        if command[-1] == 'click':
+            self.clicks.append(session_id)
+            return 200, None
+        return 404, {'error': 'unknown command', 'message': ''}
+
+
+@pom.ui.register_ui(button=aio.AsyncBlock(By.ID, 'button'),
+                    missing=aio.AsyncUI(By.ID, 'missing'))
+class PageMain(aio.AsyncPage):
+    url = '/'
+
+
+@pom.register_pages([PageMain])
+class Application(aio.AsyncApp):
+    pass
+
+
+@pytest.fixture
+def loop():
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def server(loop):
+    server = StubWebDriver()
+    loop.run_until_complete(server.start())
+    yield server
+    server.server.close()
+    for writer in server.writers:
+        writer.close()
+    loop.run_until_complete(asyncio.sleep(0.01))
+
+
+def test_apps_run_concurrently_with_pooled_connections(loop, server):
+    pool = aio.HTTPPool(server.url, size=4)
+
+    async def scenario():
+        async with Application('http://app', server.url, pool=pool) as app:
+            await app.page_main.open()
+            await app.page_main.button.click()
+            return app.webdriver.session_id
+
+    async def main():
+        return await asyncio.gather(*[scenario() for _ in range(10)])
+
+    session_ids = loop.run_until_complete(main())
+    pool.close()
+
+    assert_that(set(session_ids), has_length(10))
+    assert_that(sorted(server.clicks), equal_to(sorted(session_ids)))
+    assert_that(server.sessions, empty())
+    assert_that(pool.connections, less_than_or_equal_to(4))
+    assert_that(pool.requests, equal_to(60))
+
+
+def test_async_ui_raises_webdriver_errors(loop, server):
+    app = Application('http://app', server.url)
+
+    async def main():
+        await app.start()
+        try:
+            with pytest.raises(exceptions.NoSuchElementException):
+                await app.page_main.find_element((By.ID, 'missing'))
+            with pytest.raises(Exception) as error:
+                await app.page_main.missing.wait_for_presence(timeout=0.2)
+            return error.value
+        finally:
+            await app.quit()
+            app.webdriver.pool.close()
+
+    error = loop.run_until_complete(main())
+    assert_that(str(error), contains_string('is still absent'))
+
+
+def test_async_block_executes_scripts_with_own_element(loop, server):
+    app = Application('http://app', server.url)
+
+    async def main():
+        await app.start()
+        try:
+            return await app.page_main.button.find_visible_elements(
+                (By.TAG_NAME, 'tr'), indexes=True)
+        finally:
+            await app.quit()
+            app.webdriver.pool.close()
+
+    found = loop.run_until_complete(main())
+    assert_that(found[0][0], equal_to(0))
+    assert_that(found[0][1].id, equal_to('el-row'))
+    assert_that(server.scripts[0][0], has_entry(aio.ELEMENT_KEY, 'el-button'))
+
+
+def test_async_ui_hides_sync_only_methods():
+    app = Application('http://app', 'http://127.0.0.1:4444')
+
+    assert_that(hasattr(app.page_main.button, 'right_click'), is_(False))
+    assert_that(hasattr(app.page_main.button, 'execute_async_script'),
+                is_(False))
+    assert_that(hasattr(app.page_main, 'batch'), is_(False))
+
+
+def test_pool_closes_connection_after_failed_request(loop):
+    pool = aio.HTTPPool('http://127.0.0.1:4444')
+    closed = []
+
+    class Writer(object):
+        def close(self):
+            closed.append(True)
+
+    async def connect():
+        return None, Writer()
+
+    async def roundtrip(*args):
+        raise asyncio.CancelledError()
+
+    pool._connect = connect
+    pool._roundtrip = roundtrip
+
+    with pytest.raises(asyncio.CancelledError):
+        loop.run_until_complete(pool.request('GET', '/status'))
+    assert_that(closed, equal_to([True]))
+    assert_that(pool._idle, empty())
@@ -0,0 +1,87 @@
+import mock
+import pytest
+from hamcrest import *
+
+from pom import base
+from pom.base import App, Page, PageRegistry, register_pages
+
+
+class PageMain(Page):
+    url = '/'
+
+
+class PageUsers(Page):
+    url = '/users'
+
+
+class PageUser(Page):
+    url = r'/users/(?P<user_id>\d+)'
+
+
+class PageSettings(Page):
+    url = '/users/settings'
+
+
+@pytest.fixture
+def app():
+    with mock.patch.dict(base.browsers, {'fake': mock.MagicMock}):
+
+        @register_pages([PageMain, PageUsers, PageUser, PageSettings])
+        class Application(App):
+            pass
+
+        yield Application('http://app/', 'fake')
+
+
+def test_registry_prefers_longer_urls():
+    registry = PageRegistry([PageMain, PageUsers, PageUser, PageSettings])
+
+    assert_that(registry.resolve('/users/settings'),
+                equal_to((PageSettings, {})))
+    assert_that(registry.resolve('/users/15/edit'),
+                equal_to((PageUser, {'user_id': '15'})))
+    assert_that(registry.resolve('/users/?page=2'), equal_to((PageUsers, {})))
+    assert_that(registry.resolve('/about'), equal_to((PageMain, {})))
+    assert_that(registry.resolve('about'), none())
+
+
+def test_registry_skips_patterns_shorter_than_literal_match():
+    registry = PageRegistry([PageUser, PageSettings])
+
+    with mock.patch.object(registry, '_patterns', []) as patterns:
+        patterns.append((5, PageUser, mock.Mock()))
+        registry.resolve('/users/settings')
+
+    patterns[0][2].match.assert_not_called()
+
+
+def test_app_defines_current_page_with_url_params(app):
+    app.webdriver.current_url = 'http://app/users/7'
+
+    page = app.current_page
+
+    assert_that(page, same_instance(app.page_user))
+    assert_that(page.url_params, equal_to({'user_id': '7'}))
+
+
+def test_app_fails_to_define_page_of_other_site(app):
+    app.webdriver.current_url = 'http://other/users'
+
+    with pytest.raises(Exception):
+        app.current_page
+
+
+def test_apps_have_isolated_registries(app):
+    @register_pages([PageMain])
+    class Other(App):
+        pass
+
+    @register_pages([PageSettings])
+    class Child(Other):
+        pass
+
+    assert_that(list(App._registered_pages), empty())
+    assert_that(list(Other._registered_pages), equal_to([PageMain]))
+    assert_that(list(Child._registered_pages),
+                equal_to([PageSettings, PageMain]))
+    assert_that(list(type(app)._registered_pages), has_length(4))
@@ -0,0 +1,127 @@
+import re
+
+import mock
+import pytest
+from hamcrest import *
+from selenium.webdriver.common.by import By
+
+from pom import ui
+from pom.base import Page
+from pom.testing import FakeWebDriver
+
+COUNTRIES = ['Austria', 'Australia', 'Germany', 'Guernsey', 'New Guinea']
+HTML = '''
+<select id="country">{0}</select>
+<select id="languages" multiple>{0}</select>
+'''.format(''.join('<option>{}</option>'.format(c) for c in COUNTRIES))
+
+
+@ui.register_ui(
+    country=ui.ComboBox(By.ID, 'country'),
+    languages=ui.ComboBox(By.ID, 'languages'))
+class PageMain(Page):
+    url = '/'
+
+
+@pytest.fixture
+def driver():
+    driver = FakeWebDriver({'http://app/': HTML})
+    driver.get('http://app/')
+    return driver
+
+
+@pytest.fixture
+def page(driver):
+    return PageMain(mock.Mock(webdriver=driver, generation=0))
+
+
+def test_option_texts_are_cached(page, driver):
+    assert_that(page.country.values, equal_to(COUNTRIES))
+    driver.reset_commands()
+
+    page.country.values
+    page.country.value = 'Germany'
+
+    assert_that(driver.commands['execute_script'], equal_to(1))
+    assert_that(page.country.value, equal_to('Germany'))
+
+
+@pytest.mark.parametrize('value, match, expected', [
+    ('Guinea', 'substring', 'New Guinea'),
+    ('Austria', 'exact', 'Austria'),
+    ('^Gu', 'regex', 'Guernsey'),
+    (re.compile('lia$'), 'exact', 'Australia'),
+])
+def test_select_matches_options(page, value, match, expected):
+    page.country.select(value, match=match)
+
+    assert_that(page.country.value, equal_to(expected))
+
+
+def test_selected_option_stays_selected(page, driver):
+    page.country.value = 'Guernsey'
+    driver.events[:] = []
+
+    page.country.value = 'G'
+
+    assert_that(page.country.value, equal_to('Guernsey'))
+    assert_that(driver.events, empty())
+
+
+def test_absent_value_raises_error(page):
+    with pytest.raises(Exception):
+        page.country.value = 'France'
+
+
+def test_multiple_combobox(page):
+    page.languages.value = ['Austria', 'Germany']
+
+    assert_that(page.languages.selected_values,
+                equal_to(['Austria', 'Germany']))
+    assert_that(page.languages.value, equal_to('Austria'))
+
+
+def test_changed_options_are_refetched(page, driver):
+    page.country.values
+    select = driver.query('#country')[0]
+    select.elements[0].remove()
+
+    page.country.value = 'Germany'
+
+    assert_that(page.country.value, equal_to('Germany'))
+    assert_that(page.country.values, equal_to(COUNTRIES[1:]))
+
+
+class ExactComboBox(ui.ComboBox):
+    match = 'exact'
+
+
+@ui.register_ui(exact=ExactComboBox(By.ID, 'country'),
+                substring=ui.ComboBox(By.ID, 'country'))
+class PageFill(Page):
+    url = '/'
+
+
+@pytest.fixture
+def fill_page():
+    driver = FakeWebDriver({'http://app/': '''
+        <select id="country">
+          <option>United States Minor Outlying Islands</option>
+          <option>United States</option>
+        </select>'''})
+    driver.get('http://app/')
+    return PageFill(mock.Mock(webdriver=driver, generation=0))
+
+
+def test_fill_respects_combobox_match(fill_page):
+    fill_page.set_values({'exact': 'United States'})
+
+    assert_that(fill_page.exact.value, equal_to('United States'))
+    assert_that(fill_page.webdriver.scripts['select_options'], equal_to(0))
+
+
+def test_fill_selects_regexp_as_usual(fill_page):
+    fill_page.set_values({'substring': re.compile('States$')})
+
+    assert_that(fill_page.substring.value, equal_to('United States'))
+    assert_that(fill_page.webdriver.scripts['set_values'], equal_to(0))
@@ -0,0 +1,124 @@
+import multiprocessing
+import os
+import sys
+import threading
+
+import mock
+import pytest
+from hamcrest import *
+from selenium.webdriver.common.by import By
+
+from pom import base, ui
+from pom.base import App, Page, register_pages, ThreadLocalApp
+
+
+class FakeElement(object):
+
+    def __init__(self, driver, locator):
+        self.driver = driver
+        self.locator = locator
+
+    def is_displayed(self):
+        return True
+
+    def click(self):
+        self.driver.clicks.append((threading.current_thread().ident,
+                                   self.locator))
+
+
+class FakeDriver(object):
+
+    def __init__(self):
+        self.clicks = []
+        self.owner = threading.current_thread().ident, os.getpid()
+
+    def find_element(self, *locator):
+        return FakeElement(self, locator)
+
+    def get(self, url):
+        self.current_url = url
+
+    def quit(self):
+        pass
+
+
+@ui.register_ui(button_save=ui.Button(By.ID, 'save'),
+                button_cancel=ui.Button(By.ID, 'cancel'))
+class PageMain(Page):
+    url = '/'
+
+
+@register_pages([PageMain])
+class Application(App):
+
+    def __init__(self):
+        with mock.patch.dict(base.browsers, {'fake': FakeDriver}):
+            super(Application, self).__init__('http://app', 'fake')
+
+
+def scenario(apps, iterations=50):
+    app = apps.get()
+    for _ in range(iterations):
+        app.page_main.open()
+        assert app.current_page is app.page_main
+        app.page_main.button_save.click()
+        app.page_main.button_cancel.click()
+    return app
+
+
+APPS = ThreadLocalApp(Application)
+
+
+def process_scenario(_):
+    app = scenario(APPS)
+    return app.webdriver.owner[1], os.getpid(), len(app.webdriver.clicks)
+
+
+@pytest.mark.skipif(sys.version_info < (3,), reason='Barrier is py3 only')
+def test_threads_use_own_apps():
+    apps = ThreadLocalApp(Application)
+    barrier = threading.Barrier(16)
+    results = {}
+
+    def worker():
+        app = scenario(apps)
+        results[threading.current_thread().ident] = app
+        barrier.wait()
+
+    threads = [threading.Thread(target=worker) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert_that(results, has_length(16))
+    for ident, app in results.items():
+        assert_that(app.webdriver.owner[0], equal_to(ident))
+        assert_that(app.webdriver.clicks, has_length(100))
+        assert_that(set(click[0] for click in app.webdriver.clicks),
+                    equal_to({ident}))
+
+    apps.quit_all()
+    assert_that(apps.get(), is_not(is_in(results.values())))
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork') or sys.version_info < (3,),
+                    reason='fork context of py3 is required')
+def test_processes_use_own_apps():
+    parent_app = APPS.get()
+
+    pool = multiprocessing.get_context('fork').Pool(4)
+    try:
+        results = pool.map(process_scenario, range(8))
+    finally:
+        pool.close()
+        pool.join()
+
+    clicks = {}
+    for owner_pid, pid, count in results:
+        assert_that(owner_pid, equal_to(pid))
+        clicks[pid] = max(clicks.get(pid, 0), count)
+
+    assert_that(sum(clicks.values()), equal_to(800))
+    assert_that(clicks, is_not(has_key(os.getpid())))
+    assert_that(parent_app.webdriver.clicks, empty())
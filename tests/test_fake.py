@@ -0,0 +1,102 @@
+import pytest
+from hamcrest import *
+from selenium.common import exceptions
+from selenium.webdriver.common.by import By
+
+from pom.testing import FakeWebDriver
+
+HTML = '''
+<div id="main" class="content wide">
+  <ul>
+    <li>first</li>
+    <li style="display: none">second</li>
+    <li><a href="/third">third link</a></li>
+  </ul>
+  <select id="combo"><option>one</option><option selected>two</option>
+  </select>
+  <input id="check" type="checkbox">
+</div>
+'''
+
+
+@pytest.fixture
+def driver():
+    driver = FakeWebDriver({'http://app/': HTML})
+    driver.get('http://app/')
+    return driver
+
+
+@pytest.mark.parametrize('by, value, count', [
+    (By.ID, 'main', 1),
+    (By.CLASS_NAME, 'wide', 1),
+    (By.TAG_NAME, 'li', 3),
+    (By.CSS_SELECTOR, 'div#main > ul li', 3),
+    (By.XPATH, '//li[contains(., "ir")]', 2),
+    (By.XPATH, '(//li)[position() > 1]', 2),
+    (By.PARTIAL_LINK_TEXT, 'third', 1),
+])
+def test_find_elements(driver, by, value, count):
+    assert_that(driver.find_elements(by, value), has_length(count))
+
+
+def test_visibility(driver):
+    items = driver.find_elements(By.TAG_NAME, 'li')
+
+    assert_that([item.is_displayed() for item in items],
+                equal_to([True, False, True]))
+    assert_that(items[1].text, equal_to(''))
+
+    with pytest.raises(exceptions.ElementNotVisibleException):
+        items[1].click()
+
+
+def test_form_controls(driver):
+    combo = driver.find_element(By.ID, 'combo')
+    check = driver.find_element(By.ID, 'check')
+
+    assert_that(combo.get_attribute('value'), equal_to('two'))
+    combo.find_element(By.TAG_NAME, 'option').click()
+    assert_that(combo.get_attribute('value'), equal_to('one'))
+
+    check.click()
+    assert_that(check.is_selected(), equal_to(True))
+
+
+def test_elements_get_stale(driver):
+    item = driver.find_element(By.TAG_NAME, 'li')
+    driver.query('li')[0].replace()
+
+    with pytest.raises(exceptions.StaleElementReferenceException):
+        item.text
+
+    button = driver.find_element(By.TAG_NAME, 'li')
+    driver.refresh()
+
+    with pytest.raises(exceptions.StaleElementReferenceException):
+        button.click()
+
+
+def test_inner_html_is_escaped_like_in_browser():
+    driver = FakeWebDriver({'http://app/': (
+        '<p title="a &quot;b&quot; &amp; c">Smith &amp; Sons&nbsp;&lt;1&gt;'
+        '<script>if (a < b) {}</script></p>')})
+    driver.get('http://app/')
+    paragraph = driver.find_element(By.TAG_NAME, 'p')
+
+    assert_that(paragraph.get_attribute('innerHTML'), equal_to(
+        'Smith &amp; Sons&nbsp;&lt;1&gt;<script>if (a < b) {}</script>'))
+    assert_that(paragraph.get_attribute('outerHTML'), starts_with(
+        '<p title="a &quot;b&quot; &amp; c">'))
+    assert_that(paragraph.get_attribute('textContent'),
+                starts_with(u'Smith & Sons\xa0<1>'))
+
+
+def test_commands_are_counted_with_latency(driver):
+    driver.reset_commands()
+    driver.latency = {'is_displayed': 0.01}
+
+    driver.find_element(By.ID, 'main').is_displayed()
+
+    assert_that(driver.commands,
+                has_entries(find_element=1, is_displayed=1))
+    assert_that(driver.command_count, equal_to(2))
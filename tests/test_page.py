@@ -34,3 +34,9 @@ def test_page_forwards(page):
 def test_page_backs(page):
     page.back()
     page.webdriver.back.assert_called_once()
+
+def test_page_navigation_is_notified(page):
+    page.refresh()
+    page.back()
+    page.forward()
+    assert_that(page.app.navigated.call_count, equal_to(3))
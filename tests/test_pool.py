@@ -0,0 +1,124 @@
+import threading
+
+import mock
+import pytest
+from hamcrest import *
+
+from pom import App, SessionPool
+
+
+@pytest.fixture
+def launcher():
+    return mock.Mock(side_effect=lambda: mock.MagicMock())
+
+
+def test_pool_prelaunches_browsers(launcher):
+    pool = SessionPool(launcher, size=2)
+
+    assert_that(launcher.call_count, equal_to(2))
+    pool.close()
+
+
+def test_app_reuses_warm_browser(launcher):
+    pool = SessionPool(launcher, size=1)
+
+    app = App('http://app', pool)
+    webdriver = app.webdriver
+    app.quit()
+
+    webdriver.quit.assert_not_called()
+    webdriver.delete_all_cookies.assert_called_once()
+    webdriver.get.assert_called_with('about:blank')
+
+    app = App('http://app', pool)
+    assert_that(app.webdriver, same_instance(webdriver))
+    assert_that(pool.hit_rate, equal_to(1.0))
+    assert_that(launcher.call_count, equal_to(1))
+
+
+def test_pool_evicts_browser_after_max_uses(launcher):
+    pool = SessionPool(launcher, size=1, max_uses=2)
+
+    for _ in range(3):
+        webdriver = pool.acquire()
+        pool.release(webdriver)
+
+    assert_that(pool.evicted, equal_to(1))
+    assert_that(launcher.call_count, equal_to(2))
+    assert_that(pool.stats, has_entries(acquired=3, hits=2))
+
+
+def test_pool_evicts_unhealthy_browser(launcher):
+    pool = SessionPool(launcher, size=1)
+
+    webdriver = pool.acquire()
+    webdriver.delete_all_cookies.side_effect = Exception('browser is dead')
+    pool.release(webdriver)
+
+    webdriver.quit.assert_called_once()
+    assert_that(pool.acquire(), is_not(same_instance(webdriver)))
+
+
+def test_pool_waits_for_released_browser(launcher):
+    pool = SessionPool(launcher, size=1)
+    webdriver = pool.acquire()
+
+    timer = threading.Timer(0.1, pool.release, [webdriver])
+    timer.start()
+
+    assert_that(pool.acquire(timeout=5), same_instance(webdriver))
+    assert_that(pool.wait_time, greater_than(0.05))
+
+    with pytest.raises(Exception):
+        pool.acquire(timeout=0.1)
+
+
+def test_app_takes_only_timeout_for_pool(launcher):
+    pool = SessionPool(launcher, size=1)
+    App('http://app', pool)
+
+    with pytest.raises(Exception) as error:
+        App('http://app', pool, timeout=0.1)
+    assert_that(str(error.value), contains_string('No free browser'))
+    with pytest.raises(TypeError):
+        App('http://app', pool, '--headless')
+
+
+def test_pool_rejects_foreign_browser(launcher):
+    pool = SessionPool(launcher, size=1)
+
+    with pytest.raises(Exception) as error:
+        pool.release(mock.MagicMock())
+    assert_that(str(error.value), contains_string("isn't taken from pool"))
+
+
+def test_pool_rejects_browser_released_twice(launcher):
+    pool = SessionPool(launcher, size=2)
+    webdriver = pool.acquire()
+    pool.release(webdriver)
+
+    with pytest.raises(Exception) as error:
+        pool.release(webdriver)
+    assert_that(str(error.value), contains_string("isn't taken from pool"))
+    assert_that(pool.acquire(), is_not(same_instance(pool.acquire())))
+
+
+def test_app_returns_browser_to_pool_once(launcher):
+    pool = SessionPool(launcher, size=2)
+    app = App('http://app', pool)
+    app.quit()
+    app.quit()
+
+    assert_that(pool.acquire(), is_not(same_instance(pool.acquire())))
+
+
+def test_pool_replaces_dead_idle_browser(launcher):
+    pool = SessionPool(launcher, size=1)
+    webdriver = pool.acquire()
+    pool.release(webdriver)
+    type(webdriver).current_url = mock.PropertyMock(
+        side_effect=Exception('browser is dead'))
+
+    assert_that(pool.acquire(), is_not(same_instance(webdriver)))
+    webdriver.quit.assert_called_once()
+    assert_that(pool.stats, has_entries(acquired=2, hits=1, evicted=1))
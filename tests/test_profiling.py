@@ -0,0 +1,102 @@
+import logging
+
+import mock
+import pytest
+from hamcrest import *
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from pom import profiling, ui
+from pom.base import Page
+from pom.testing import FakeWebDriver
+from pom.utils import timeit, TIMEIT_LOG
+
+
+class Widget(object):
+
+    def __repr__(self):
+        raise AssertionError('repr is called')
+
+    @timeit
+    def action(self):
+        return 'done'
+
+
+@ui.register_ui(button=ui.Button(By.ID, 'button'))
+class PageMain(Page):
+    url = '/'
+
+
+@pytest.fixture
+def page():
+    driver = FakeWebDriver({'http://app/': '<button id="button">OK</button>'})
+    driver.get('http://app/')
+    driver.reset_commands()
+    return PageMain(mock.Mock(webdriver=driver, generation=0))
+
+
+def test_disabled_profiling_skips_formatting():
+    # test runner can enable debug logging, so timeit logger level is pinned
+    level = TIMEIT_LOG.level
+    TIMEIT_LOG.setLevel(logging.INFO)
+    try:
+        assert_that(Widget().action(), equal_to('done'))
+    finally:
+        TIMEIT_LOG.setLevel(level)
+
+
+def test_spans_count_webdriver_requests(page):
+    spans = []
+
+    with profiling.profile(spans.append):
+        page.button.click()
+
+    span = spans[-1]
+    assert_that(span.op, equal_to('Button.click'))
+    assert_that(span.target, equal_to("Button(by='id', value='button')"))
+    assert_that(span.page, equal_to('PageMain'))
+    assert_that(span.depth, equal_to(0))
+    assert_that(span.commands, equal_to(page.webdriver.command_count))
+
+
+def test_nested_spans_accumulate_requests():
+    spans = []
+
+    class Nested(object):
+
+        @timeit
+        def inner(self):
+            profiling.count_command()
+
+        @timeit
+        def outer(self):
+            profiling.count_command()
+            self.inner()
+
+    with profiling.profile(spans.append):
+        Nested().outer()
+
+    assert_that([(s.op, s.depth, s.commands) for s in spans],
+                equal_to([('Nested.inner', 1, 1), ('Nested.outer', 0, 2)]))
+
+
+def test_report_aggregates_operations(page):
+    with profiling.profile() as report:
+        page.button.click()
+        page.button.click()
+
+    stat, = [s for s in report.stats if s.op == 'Button.click']
+    assert_that(stat.calls, equal_to(2))
+    assert_that(report.slowest(1)[0][0],
+                equal_to(("Button(by='id', value='button')", 'PageMain')))
+    assert_that(report.chattiest(1)[0].op, equal_to('Button.click'))
+    assert_that(report.format(), contains_string('Chattiest operations'))
+
+
+def test_webdriver_requests_are_counted_while_profiling():
+    with profiling.profile():
+        assert_that(WebDriver.__dict__['execute'],
+                    is_not(same_instance(profiling._original_execute)))
+
+    assert_that(WebDriver.__dict__['execute'],
+                same_instance(profiling._original_execute))
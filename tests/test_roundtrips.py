@@ -0,0 +1,307 @@
+import mock
+import pytest
+from hamcrest import *
+from selenium.webdriver.common.by import By
+
+from pom import base, ui
+from pom.base import App, Page, register_pages
+from pom.testing import FakeWebDriver
+
+ROWS = ''.join(
+    '<tr><td>{0}</td><td>user-{0}</td><td>{1}</td></tr>'.format(
+        i, 'active' if i % 2 else 'blocked') for i in range(20))
+OPTIONS = ''.join('<option>option {}</option>'.format(i) for i in range(50))
+HTML = '''
+<form id="form">
+  <input id="name" type="text">
+  <input id="email" type="text">
+  <input id="avatar" type="file">
+  <select id="combo">{options}</select>
+  <input id="agree" type="checkbox" checked>
+  <button id="submit">OK</button>
+</form>
+<div id="spinner" style="display: none">Loading</div>
+<div id="outer"><div class="inner"><section>
+  <button>Deep</button><button>Deeper</button>
+</section></div></div>
+<table id="users">
+  <thead><tr><th>Id</th><th>Name</th><th>Status</th></tr></thead>
+  <tbody>{rows}</tbody>
+</table>
+'''.format(options=OPTIONS, rows=ROWS)
+
+
+class FormMain(ui.Form):
+    pass
+
+
+class TableUsers(ui.Table):
+    columns = {'id': 1, 'name': 2, 'status': 3}
+
+
+ui.register_ui(
+    name=ui.TextField(By.ID, 'name'),
+    email=ui.TextField(By.ID, 'email'),
+    avatar=ui.FileField(By.ID, 'avatar'),
+    combo=ui.ComboBox(By.ID, 'combo'),
+    agree=ui.CheckBox(By.ID, 'agree'),
+    submit=ui.Button(By.ID, 'submit'))(FormMain)
+
+
+class BlockSection(ui.Block):
+    pass
+
+
+class BlockInner(ui.Block):
+    pass
+
+
+class BlockOuter(ui.Block):
+    pass
+
+
+ui.register_ui(first=ui.Button(By.XPATH, './/button', index=0),
+               button=ui.Button(By.XPATH, './/button', index=1),
+               last=ui.Button(By.XPATH, './/button', index=-1))(BlockSection)
+ui.register_ui(section=BlockSection(By.TAG_NAME, 'section'))(BlockInner)
+ui.register_ui(inner=BlockInner(By.CLASS_NAME, 'inner'))(BlockOuter)
+
+
+@ui.register_ui(
+    outer=BlockOuter(By.ID, 'outer'),
+    last_button=ui.Button(By.TAG_NAME, 'button', index=-1),
+    missing=ui.Button(By.TAG_NAME, 'nav', index=-1),
+    form=FormMain(By.ID, 'form'),
+    spinner=ui.Block(By.ID, 'spinner'),
+    users=TableUsers(By.ID, 'users'))
+class PageMain(Page):
+    url = '/'
+
+
+@pytest.fixture
+def driver():
+    return FakeWebDriver({'http://app/': HTML})
+
+
+@pytest.fixture
+def page(driver):
+    with mock.patch.dict(base.browsers, {'fake': lambda: driver}):
+
+        @register_pages([PageMain])
+        class Application(App):
+            pass
+
+        app = Application('http://app', 'fake')
+
+    app.open('/')
+    driver.reset_commands()
+    return app.page_main
+
+
+def test_click_roundtrips(page, driver):
+    page.form.submit.click()
+
+    assert_that(driver.command_count, less_than_or_equal_to(5))
+    assert_that(driver.query('#submit')[0].clicks, equal_to(1))
+
+
+def test_nested_ui_roundtrips(page, driver):
+    page.outer.inner.section.button.click()
+
+    assert_that(driver.query('section button')[1].clicks, equal_to(1))
+    assert_that(driver.command_count, less_than_or_equal_to(3))
+
+
+def test_zero_index_roundtrips(page, driver):
+    page.outer.inner.section.first.click()
+
+    assert_that(driver.query('section button')[0].clicks, equal_to(1))
+    assert_that(driver.query('section button')[1].clicks, equal_to(0))
+    assert_that(driver.commands['findElements'], equal_to(0))
+
+
+def test_negative_index_counts_from_end(page, driver):
+    page.last_button.click()
+    page.outer.inner.section.last.click()
+
+    assert_that(driver.query('section button')[1].clicks, equal_to(2))
+    assert_that(page.missing.is_present, equal_to(False))
+
+
+def test_text_field_roundtrips(page, driver):
+    page.form.name.value = 'admin'
+
+    assert_that(driver.command_count, less_than_or_equal_to(6))
+    assert_that(driver.query('#name')[0].attrs['value'], equal_to('admin'))
+
+
+def test_form_fill_roundtrips(page, driver):
+    page.form.fill(name='admin', email='admin@example.com',
+                   combo='option 40', avatar='/tmp/avatar.png')
+
+    assert_that(driver.scripts['set_values'], equal_to(1))
+    assert_that(driver.command_count, less_than_or_equal_to(8))
+    assert_that([driver.query(selector)[0].attrs['value'] for selector in
+                 ('#name', '#email', '#avatar')],
+                equal_to(['admin', 'admin@example.com', '/tmp/avatar.png']))
+    assert_that(page.form.combo.value, equal_to('option 40'))
+    assert_that(driver.events, has_length(6))
+
+
+def test_form_fill_falls_back_to_keystrokes(page, driver):
+    driver.query('#email')[0].attrs['readonly'] = ''
+
+    page.form.fill(name='admin', email='admin@example.com')
+
+    assert_that(driver.scripts['set_values'], equal_to(1))
+    assert_that(driver.commands['send_keys'], equal_to(1))
+    assert_that(driver.query('#email')[0].attrs['value'],
+                equal_to('admin@example.com'))
+
+
+def test_read_values_roundtrips(page, driver):
+    driver.query('#email')[0].attrs['disabled'] = ''
+    page.form.name.value = 'admin'
+    driver.reset_commands()
+
+    values = page.read_values()
+    states = page.form.read_values(states=True)
+
+    assert_that(driver.scripts['read_values'], equal_to(2))
+    assert_that(driver.command_count, less_than_or_equal_to(4))
+    assert_that(values, equal_to({
+        'form': {'name': 'admin', 'email': '', 'avatar': '',
+                 'combo': 'option 0', 'agree': True},
+        'outer': {'inner': {'section': {}}},
+        'users': {}}))
+    assert_that(states, has_entries(
+        email={'is_present': True, 'is_enabled': False, 'value': ''},
+        submit={'is_present': True, 'is_enabled': True}))
+
+
+def test_combobox_roundtrips(page, driver):
+    page.form.combo.value = 'option 40'
+
+    assert_that(driver.command_count, less_than_or_equal_to(6))
+    assert_that(page.form.combo.value, equal_to('option 40'))
+
+
+def test_table_rows_roundtrips(page, driver):
+    driver.query('tbody tr')[0].hide()
+
+    rows = page.users.rows
+
+    assert_that([row.index for row in rows], equal_to(list(range(1, 20))))
+    assert_that(driver.scripts['find_visible'], equal_to(1))
+    assert_that(driver.command_count, less_than_or_equal_to(3))
+
+
+def test_table_row_access_roundtrips(page, driver):
+    rows = page.users.rows
+    driver.reset_commands()
+
+    for row in rows:
+        row.click()
+
+    # rows take own elements from the shared list, siblings aren't refetched
+    assert_that(driver.commands['findElements'], equal_to(0))
+    assert_that(driver.scripts['find_chain'], equal_to(0))
+    assert_that(driver.command_count, less_than_or_equal_to(3 * len(rows)))
+
+
+def test_table_cells_access_roundtrips(page, driver):
+    cells = page.users.rows[5].cells
+    driver.reset_commands()
+
+    assert_that([cell.value for cell in cells],
+                equal_to(['5', 'user-5', 'active']))
+    assert_that(driver.scripts['find_chain'], equal_to(0))
+    assert_that(driver.commands['findElements'], equal_to(0))
+
+
+def test_stale_row_is_found_by_index(page, driver):
+    rows = page.users.rows
+    driver.query('tbody tr')[3].replace()
+    driver.reset_commands()
+
+    rows[3].click()
+
+    assert_that(driver.query('tbody tr')[3].clicks, equal_to(1))
+    assert_that(driver.commands['findElements'], equal_to(0))
+    assert_that(driver.scripts['find_chain'], equal_to(1))
+
+
+def test_table_iter_rows_roundtrips(page, driver):
+    driver.query('tbody tr')[0].hide()
+
+    row = next(page.users.iter_rows(chunk_size=5))
+
+    assert_that(row.index, equal_to(1))
+    assert_that(driver.scripts['rows_window'], equal_to(1))
+    assert_that(driver.command_count, less_than_or_equal_to(5))
+
+
+def test_table_cell_roundtrips(page, driver):
+    assert_that(page.users.row(name='user-5').cell('status').value,
+                equal_to('active'))
+    assert_that(driver.command_count, less_than_or_equal_to(9))
+
+
+def test_table_snapshot_roundtrips(page, driver):
+    assert_that(page.users.snapshot(), has_length(20))
+    assert_that(driver.command_count, less_than_or_equal_to(5))
+
+
+def test_wait_for_presence_roundtrips(page, driver):
+    driver.query('#spinner')[0].show(after=0.1)
+
+    page.spinner.wait_for_presence()
+
+    assert_that(driver.command_count, less_than_or_equal_to(3))
+
+
+def test_batch_roundtrips(page, driver):
+    with page.batch():
+        page.form.name.value = 'admin'
+        page.form.agree.unselect()
+        page.form.combo.value = 'option 40'
+        page.form.avatar.value = 'avatar.png'
+        page.form.submit.click()
+
+    assert_that(driver.scripts['batch'], equal_to(2))
+    assert_that(driver.command_count, less_than_or_equal_to(6))
+    assert_that(page.read_values()['form'], has_entries(
+        name='admin', agree=False, combo='option 40'))
+    assert_that(driver.query('#avatar')[0].attrs['value'],
+                equal_to('avatar.png'))
+    assert_that(driver.query('#submit')[0].clicks, equal_to(1))
+
+
+def test_batch_click_ends_script(page, driver):
+    generation = page.app.generation
+
+    with page.batch():
+        page.form.name.value = 'admin'
+        page.form.submit.click()
+        page.form.agree.unselect()
+
+    assert_that(driver.scripts['batch'], equal_to(2))
+    assert_that(page.app.generation, equal_to(generation + 1))
+    assert_that(driver.query('#submit')[0].clicks, equal_to(1))
+    assert_that(page.read_values()['form'], has_entries(
+        name='admin', agree=False))
+
+
+def test_batch_reports_failed_action(page, driver):
+    with mock.patch.object(ui.Block, 'timeout', 0.1):
+        with pytest.raises(Exception) as error:
+            with page.batch():
+                page.form.submit.click()
+                page.spinner.click()
+                page.form.name.value = 'admin'
+
+    assert_that(str(error.value),
+                contains_string("Batch action 2 of 3 failed on Block(by='id', "
+                                "value='spinner')"))
+    assert_that(driver.query('#submit')[0].clicks, equal_to(1))
+    assert_that(driver.query('#name')[0].attrs.get('value'), none())
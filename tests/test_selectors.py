@@ -0,0 +1,101 @@
+import mock
+import pytest
+from hamcrest import *
+from selenium.webdriver.common.by import By
+
+from pom import ui
+from pom.base import Page
+from pom.testing import FakeWebDriver
+from pom.ui import selectors
+
+HTML = '''
+<table id="users">
+  <thead><tr><th>Name</th><th>Title</th></tr></thead>
+  <tbody>
+    <tr><td>admin</td><td>The "boss"</td></tr>
+    <tr><td>o'neil</td><td>It's "mine"</td></tr>
+  </tbody>
+</table>
+'''
+
+
+class TableUsers(ui.Table):
+    columns = {'name': 'Name', 'title': 2}
+
+
+@ui.register_ui(users=TableUsers(By.ID, 'users'))
+class PageMain(Page):
+    url = '/'
+
+
+@pytest.fixture
+def page():
+    driver = FakeWebDriver({'http://app/': HTML})
+    driver.get('http://app/')
+    return PageMain(mock.Mock(webdriver=driver, generation=0))
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('simple', '"simple"'),
+    ('say "hi"', '\'say "hi"\''),
+    ('it\'s "mine"', 'concat("it\'s ", \'"\', "mine", \'"\', "")'),
+])
+def test_literal_escapes_quotes(value, expected):
+    assert_that(selectors.literal(value), equal_to(expected))
+
+
+def test_row_template_is_compiled_once():
+    template = selectors.row_template('.//tr', './/td', (1, 2))
+
+    assert_that(selectors.row_template('.//tr', './/td', (1, 2)),
+                same_instance(template))
+    assert_that(template.render('a', 'b'), equal_to(
+        './/tr[.//td[position()=1 and contains(., "a")] and '
+        './/td[position()=2 and contains(., "b")]]'))
+
+
+def test_merge_adds_condition_to_predicate():
+    assert_that(selectors.merge('.//tr[@class="x"]', 'position()=1'),
+                equal_to('.//tr[@class="x" and position()=1]'))
+
+
+@pytest.mark.parametrize('name, title', [
+    ('admin', 'The "boss"'),
+    ("o'neil", 'It\'s "mine"'),
+])
+def test_row_is_found_by_values_with_quotes(page, name, title):
+    row = page.users.row(name=name, title=title)
+
+    assert_that(row.cell('name').value, equal_to(name))
+    assert_that(row.cell('title').value, equal_to(title))
+
+
+def test_template_renders_values_of_any_type():
+    template = selectors.row_template('.//tr', './/td', (1, 2, 3))
+
+    assert_that(template.render('a', 2, 'say "hi"'), equal_to(
+        './/tr[.//td[position()=1 and contains(., "a")] and '
+        './/td[position()=2 and contains(., "2")] and '
+        './/td[position()=3 and contains(., \'say "hi"\')]]'))
+
+
+def test_snapshot_resolves_header_texts(page):
+    rows = page.users.snapshot()
+
+    assert_that(rows[1]['name'], equal_to("o'neil"))
+    assert_that(dict(rows[0]), equal_to({'name': 'admin',
+                                         'title': 'The "boss"'}))
+
+
+class TableTypo(ui.Table):
+    columns = {'name': 'Nmae'}
+
+
+def test_missing_header_text_matches_nothing(page):
+    table = TableTypo(By.ID, 'users')
+    table.container = page
+
+    assert_that(table.row(name='admin').is_present, equal_to(False))
+    assert_that(table.rows[0].cell('name').is_present, equal_to(False))
+    with pytest.raises(KeyError):
+        table.snapshot()[0]['name']
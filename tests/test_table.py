@@ -0,0 +1,203 @@
+import mock
+import pytest
+from hamcrest import *
+from selenium.webdriver.common.by import By
+
+from pom import ui
+from pom.base import Page
+from pom.testing import Element, FakeWebDriver, Text
+from pom.ui import scripts
+from pom.ui.base import STATS
+
+
+class Table(ui.Table):
+    columns = {'name': 1, 'status': 2}
+
+
+@pytest.fixture
+def table():
+    table = Table(By.ID, 'table')
+    table.container = Page(mock.MagicMock())
+    return table
+
+
+def _return(table, *results):
+    """Make table scripts return results, except script finding elements."""
+    results = list(results)
+
+    def execute_script(script, *args):
+        if script == scripts.FIND_CHAIN:
+            return mock.MagicMock()
+        return results.pop(0)
+
+    table.webdriver.execute_script.side_effect = execute_script
+
+
+def _table_scripts(table):
+    return [call for call in table.webdriver.execute_script.call_args_list
+            if call[0][0] != scripts.FIND_CHAIN]
+
+
+def test_table_snapshot_uses_one_script(table):
+    _return(table, [[0, ['a', 'up']], [2, ['b', None]]])
+
+    rows = table.snapshot()
+
+    assert_that(_table_scripts(table), has_length(1))
+    assert_that(rows, has_length(2))
+    assert_that(rows[0]['name'], equal_to('a'))
+    assert_that(rows[1]['status'], none())
+    assert_that(dict(rows[1]), equal_to({'name': 'b', 'status': None}))
+
+
+def test_table_snapshot_row_is_immutable(table):
+    _return(table, [[0, ['a', 'up']]])
+    row = table.snapshot()[0]
+
+    with pytest.raises(TypeError):
+        row['name'] = 'b'
+
+
+def test_table_snapshot_gives_live_row(table):
+    _return(table, [[3, ['a', 'up']]])
+    row = table.snapshot()[0].row
+
+    assert_that(row, instance_of(ui.Row))
+    assert_that(row.index, equal_to(3))
+    assert_that(row.container, same_instance(table.body))
+
+
+def test_iter_rows_fetches_chunks_lazily(table):
+    _return(table, [[0, 2], 5], [[3, 4], 5])
+
+    rows = table.iter_rows(chunk_size=3)
+    first = next(rows)
+
+    assert_that(_table_scripts(table), has_length(1))
+    assert_that(first.index, equal_to(0))
+    assert_that(first.container, same_instance(table.body))
+    assert_that([row.index for row in rows], equal_to([2, 3, 4]))
+    assert_that(_table_scripts(table), has_length(2))
+    assert_that(_table_scripts(table)[-1][0][2:],
+                equal_to(('.//tr', 3, 3)))
+
+
+class VirtualTable(ui.VirtualTable):
+    columns = {'name': 1, 'status': 2}
+    key_column = 'name'
+
+
+def _render_rows(driver, start):
+    body = driver.query('tbody')[0]
+    body.children[:] = []
+    for index in range(start, min(start + 10, 100)):
+        row = body.append(Element('tr'))
+        for value in ('user-{}'.format(index), 'active'):
+            row.append(Element('td')).append(Text(value))
+
+
+@pytest.fixture
+def virtual_table():
+    driver = FakeWebDriver({'http://app/': '<table id="table"><tbody>'})
+    driver.get('http://app/')
+    window = [0]
+
+    def scroll(driver, element):
+        window[0] += 5  # windows overlap
+        _render_rows(driver, window[0])
+
+    _render_rows(driver, 0)
+    driver.on_scroll.append(scroll)
+    table = VirtualTable(By.ID, 'table')
+    table.container = Page(mock.Mock(webdriver=driver, generation=0))
+    return table
+
+
+def test_virtual_table_streams_unique_rows(virtual_table):
+    rows = list(virtual_table.iter_rows_data())
+
+    assert_that([row['name'] for row in rows],
+                equal_to(['user-{}'.format(i) for i in range(100)]))
+    assert_that(virtual_table.scroll_steps, equal_to(20))
+
+
+def test_virtual_table_stops_scrolling_at_match(virtual_table):
+    steps = STATS['scroll_steps']
+
+    row = virtual_table.row(name='user-23')
+
+    assert_that(row.cell('name').value, equal_to('user-23'))
+    assert_that(virtual_table.scroll_steps, equal_to(3))
+    assert_that(STATS['scroll_steps'] - steps, equal_to(3))
+
+
+def test_virtual_table_matches_text_of_cells(virtual_table):
+    cell = virtual_table.webdriver.query('tbody td')[4]
+    cell.children[:] = []
+    cell.append(Text('Smith & Sons'))
+
+    row = virtual_table.row(name='Smith & Sons')
+
+    assert_that(row.cell('status').value, equal_to('active'))
+    assert_that(virtual_table.scroll_steps, equal_to(0))
+
+
+def test_virtual_table_fails_without_match(virtual_table):
+    with pytest.raises(Exception):
+        virtual_table.row(name='user-200')
+
+
+class DiscoveredTable(ui.Table):
+    discover_columns = True
+
+
+@pytest.fixture
+def discovered_table():
+    driver = FakeWebDriver({'http://app/': '''
+        <table id="table">
+          <thead><tr><th></th><th>User  name</th><th>Status</th></tr></thead>
+          <tbody>
+            <tr><td>1</td><td>admin</td><td>active</td></tr>
+            <tr><td>2</td><td>guest</td><td>blocked</td></tr>
+          </tbody>
+        </table>'''})
+    driver.get('http://app/')
+    app = mock.Mock(webdriver=driver, generation=0)
+    table = DiscoveredTable(By.ID, 'table')
+    table.container = Page(app)
+    return table
+
+
+def test_table_discovers_columns_once(discovered_table):
+    driver = discovered_table.webdriver
+
+    assert_that(discovered_table.body.columns,
+                equal_to({'user_name': 2, 'status': 3}))
+    driver.reset_commands()
+
+    row = discovered_table.row(user_name='guest')
+
+    assert_that(row.cell('status').value, equal_to('blocked'))
+    assert_that(discovered_table.snapshot()[0],
+                has_entries(user_name='admin', status='active'))
+    assert_that(driver.scripts['cell_texts'], equal_to(0))
+
+
+def test_discovered_columns_are_renewed_after_navigation(discovered_table):
+    discovered_table.body.columns
+    driver = discovered_table.webdriver
+    driver.query('th')[2].children[0].text = 'State'
+    discovered_table.container.app.generation = 1
+
+    assert_that(discovered_table.body.columns, has_entries(state=3))
+
+
+def test_table_columns_are_set_per_instance():
+    table = ui.Table(By.ID, 'table')
+    table.container = Page(mock.MagicMock())
+    table.columns = {'name': 1, 'status': 2}
+    _return(table, [[0, ['a', 'up']]])
+
+    assert_that(table.body.columns, has_entries(name=1))
+    assert_that(dict(table.snapshot()[0]), equal_to({'name': 'a',
+                                                     'status': 'up'}))
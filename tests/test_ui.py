@@ -0,0 +1,164 @@
+import mock
+import pytest
+from hamcrest import *
+from selenium.common import exceptions
+from selenium.webdriver.common.by import By
+
+from pom import ui
+from pom.base import Page
+
+
+@pytest.fixture
+def page():
+    return Page(mock.MagicMock())
+
+
+@pytest.fixture
+def button(page):
+    button = ui.Button(By.ID, 'button')
+    button.container = page
+    return button
+
+
+def test_wait_for_present_ui_takes_one_request(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.return_value = True
+
+    button.wait_for_presence()
+
+    webelement.is_displayed.assert_called_once()
+    button.webdriver.execute_async_script.assert_not_called()
+
+
+def test_wait_for_presence_uses_observer(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.return_value = False
+    button.webdriver.execute_async_script.return_value = True
+
+    button.wait_for_presence()
+
+    webelement.is_displayed.assert_called_once()
+    button.webdriver.execute_async_script.assert_called_once()
+    assert_that(button.webdriver.execute_async_script.call_args[0][1:4],
+                equal_to((None, By.ID, 'button')))
+
+
+def test_wait_for_presence_falls_back_to_polling(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.side_effect = [False, False, True]
+    button.webdriver.execute_async_script.side_effect = \
+        exceptions.TimeoutException()
+
+    button.wait_for_presence()
+
+    assert_that(webelement.is_displayed.call_count, equal_to(3))
+
+
+def test_failed_observer_isnt_retried_with_the_same_webdriver(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.side_effect = [False, True, False, True]
+    button.webdriver.execute_async_script.side_effect = \
+        exceptions.WebDriverException('script timeout')
+
+    button.wait_for_presence()
+    button.wait_for_presence()
+
+    button.webdriver.execute_async_script.assert_called_once()
+
+
+def test_wait_for_absence_polls_with_timeout(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.return_value = True
+    button.wait_strategy = 'poll'
+
+    with pytest.raises(Exception) as error:
+        button.wait_for_absence(timeout=0.2)
+
+    assert_that(str(error.value), contains_string('is still present'))
+    button.webdriver.execute_async_script.assert_not_called()
+
+
+def test_presence_check_is_elided_within_ttl(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.return_value = True
+    button.presence_ttl = 10
+    button.container.app.generation = 0
+
+    button.click()
+    button.click()
+
+    webelement.is_displayed.assert_called_once()
+    assert_that(webelement.click.call_count, equal_to(2))
+
+
+def test_presence_check_is_repeated_after_navigation(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.return_value = True
+    button.presence_ttl = 10
+    button.container.app.generation = 0
+
+    button.click()
+    button.container.app.generation = 1
+    button.click()
+
+    assert_that(webelement.is_displayed.call_count, equal_to(2))
+
+
+def test_elided_action_waits_if_ui_has_gone(button):
+    webelement = button.webdriver.find_element.return_value
+    webelement.is_displayed.return_value = True
+    button.presence_ttl = 10
+    button.container.app.generation = 0
+
+    button.click()
+    webelement.click.side_effect = [
+        exceptions.ElementNotVisibleException(), None]
+    button.click()
+
+    assert_that(webelement.is_displayed.call_count, equal_to(2))
+    assert_that(webelement.click.call_count, equal_to(3))
+
+
+def test_webelement_is_renewed_after_navigation(button):
+    button.container.app.generation = 0
+    webelement = button.webelement
+
+    assert_that(button.webelement, same_instance(webelement))
+    button.container.app.generation = 1
+    assert_that(button.webelement, is_not(same_instance(webelement)))
+
+
+def test_form_submit_navigates(page):
+    form = ui.Form(By.ID, 'form')
+    form.container = page
+
+    form.submit()
+
+    page.app.navigated.assert_called_once()
+
+
+class Frame(ui.Container):
+
+    def __init__(self, webdriver):
+        self.webdriver = self.webelement = webdriver
+
+
+def test_ui_works_in_custom_container():
+    frame = Frame(mock.MagicMock())
+    button = ui.Button(By.ID, 'button')
+    button.container = frame
+    frame.webdriver.find_element.return_value.is_displayed.return_value = True
+
+    button.click()
+    ui.navigates(ui.Button.click)(button)
+
+    assert_that(frame.webdriver.find_element.return_value.click.call_count,
+                equal_to(2))
+
+
+def test_settings_are_assigned_to_instance():
+    button = ui.Button(By.ID, 'button')
+    button.timeout = 30
+
+    assert_that(button.timeout, equal_to(30))
+    assert_that(ui.Button.timeout, equal_to(10))
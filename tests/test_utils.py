@@ -0,0 +1,92 @@
+import pytest
+from hamcrest import *
+
+from pom import utils
+
+
+class Calculator(object):
+
+    def __init__(self):
+        self.calls = 0
+        self.generation = 0
+
+    @utils.cache
+    def empty(self):
+        self.calls += 1
+        return []
+
+    @utils.cache(maxsize=2)
+    def double(self, value):
+        self.calls += 1
+        return value * 2
+
+    @utils.cache
+    def echo(self, *args, **kwgs):
+        return args, kwgs
+
+    @utils.cache(scope='generation')
+    def scoped(self):
+        self.calls += 1
+        return self.generation
+
+
+@pytest.fixture
+def calc():
+    return Calculator()
+
+
+def test_cache_keeps_falsy_result(calc):
+    calc.empty()
+    calc.empty()
+    assert_that(calc.calls, equal_to(1))
+
+
+def test_cache_keys_on_arguments(calc):
+    assert_that(calc.double(1), equal_to(2))
+    assert_that(calc.double(2), equal_to(4))
+    calc.double(1)
+    assert_that(calc.calls, equal_to(2))
+
+
+def test_cache_separates_positional_and_keyword_arguments(calc):
+    assert_that(calc.echo(('x', 1)), equal_to(((('x', 1),), {})))
+    assert_that(calc.echo(x=1), equal_to(((), {'x': 1})))
+
+
+def test_cache_drops_least_recently_used(calc):
+    calc.double(1)
+    calc.double(2)
+    calc.double(1)
+    calc.double(3)
+    calc.double(1)
+    assert_that(calc.calls, equal_to(3))
+    calc.double(2)
+    assert_that(calc.calls, equal_to(4))
+
+
+def test_cache_is_invalidated_with_scope(calc):
+    calc.scoped()
+    calc.scoped()
+    calc.generation += 1
+    assert_that(calc.scoped(), equal_to(1))
+    assert_that(calc.calls, equal_to(2))
+
+
+def test_cache_is_invalidated_explicitly(calc):
+    calc.empty()
+    Calculator.empty.invalidate(calc)
+    calc.empty()
+    calc.double(1)
+    utils.invalidate(calc)
+    calc.double(1)
+    assert_that(calc.calls, equal_to(4))
+
+
+def test_cache_counts_hits_and_misses():
+    info = Calculator.scoped.cache_info()
+    calc = Calculator()
+    calc.scoped()
+    calc.scoped()
+    assert_that(Calculator.scoped.cache_info().hits, equal_to(info.hits + 1))
+    assert_that(Calculator.scoped.cache_info().misses,
+                equal_to(info.misses + 1))